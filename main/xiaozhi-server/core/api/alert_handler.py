@@ -7,7 +7,7 @@ from config.logger import setup_logging
 from core.api.base_handler import BaseHandler
 
 # 引入告警队列管理器
-from core.services.cluster_alert_queue import alert_queue_manager
+from core.services.cluster_alert_queue import ProduceResult, get_alert_queue_manager
 
 TAG = __name__
 
@@ -84,13 +84,17 @@ class AlertHandler(BaseHandler):
             }
             
             # 将告警加入生产者队列
-            queue_result = False
+            queue_result = None
             try:
                 if request_body and isinstance(request_body, dict):
-                    queue_result = alert_queue_manager.produce_alert(alert_data)
-                    if queue_result:
+                    queue_manager = get_alert_queue_manager()
+                    queue_result = queue_manager.produce_alert(alert_data)
+                    if queue_result is ProduceResult.ACCEPTED:
                         print(f"[告警推送] ✅ 告警已加入队列 (来源: {remote_addr})", flush=True)
                         self.logger.bind(tag=TAG).info(f"告警已加入队列 - 来源: {remote_addr}")
+                    elif queue_result is ProduceResult.FULL:
+                        print(f"[告警推送] ⚠️  告警队列已满，返回429 (来源: {remote_addr})", flush=True)
+                        self.logger.bind(tag=TAG).warning(f"告警队列已满，拒绝告警 - 来源: {remote_addr}")
                     else:
                         print(f"[告警推送] ⚠️  告警跳过队列处理 (非集群告警)", flush=True)
                         self.logger.bind(tag=TAG).info("告警跳过队列处理 - 非集群告警")
@@ -101,6 +105,15 @@ class AlertHandler(BaseHandler):
                 print(f"[告警推送] ❌ 告警队列处理错误: {queue_error}", flush=True)
                 self.logger.bind(tag=TAG).error(f"告警队列处理错误: {queue_error}")
             
+            # 集群队列达到高水位时返回429，由告警源稍后重试
+            if queue_result is ProduceResult.FULL:
+                busy_response = {
+                    "status": "busy",
+                    "message": "告警队列已满，请稍后重试",
+                    "timestamp": datetime.now().isoformat()
+                }
+                return web.json_response(busy_response, status=429)
+            
             # 返回成功响应
             response_data = {
                 "status": "success",
@@ -113,7 +126,7 @@ class AlertHandler(BaseHandler):
                     "has_request_body": bool(request_body)
                 },
                 "queue_status": {
-                    "added_to_queue": queue_result,
+                    "added_to_queue": queue_result is ProduceResult.ACCEPTED,
                     "queue_enabled": True
                 }
             }
@@ -0,0 +1,375 @@
+"""
+腾讯云MCP服务器脚本的公共部分
+
+tencent_mcp.py 与 tencent_mcp_cut.py 共用的客户端缓存、接口级并发限制、
+相同只读请求合并、列表接口短时缓存以及异常转换
+"""
+
+import json
+import time
+import asyncio
+from collections import OrderedDict
+from functools import lru_cache, partial, wraps
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from mcp.server.fastmcp.exceptions import ToolError
+
+# 引入腾讯云SDK
+from tencentcloud.common import credential
+from tencentcloud.common.profile.client_profile import ClientProfile
+from tencentcloud.common.profile.http_profile import HttpProfile
+from tencentcloud.common.exception.tencent_cloud_sdk_exception import (
+    TencentCloudSDKException,
+)
+from tencentcloud.tke.v20180525 import tke_client
+from tencentcloud.tke.v20220501 import tke_client as tke_client_2022
+from tencentcloud.cls.v20201016 import cls_client
+from tencentcloud.monitor.v20180724 import monitor_client
+
+
+def _build_client_profile(endpoint: str) -> ClientProfile:
+    """构建开启长连接的客户端配置"""
+    http_profile = HttpProfile()
+    http_profile.endpoint = endpoint
+    http_profile.keepAlive = True
+    http_profile.reqTimeout = 30
+
+    client_profile = ClientProfile()
+    client_profile.httpProfile = http_profile
+    return client_profile
+
+
+# 各服务共享的客户端配置，导入时构建一次，避免每次调用重复创建
+_CLIENT_PROFILES = {
+    "tke": _build_client_profile("tke.tencentcloudapi.com"),
+    "monitor": _build_client_profile("monitor.tencentcloudapi.com"),
+    "cls": _build_client_profile("cls.tencentcloudapi.com"),
+}
+
+
+def _dump(resp) -> str:
+    """将SDK响应序列化为JSON字符串，安装了orjson时使用orjson加速"""
+    if orjson is not None:
+        return orjson.dumps(resp._serialize(allow_none=True)).decode("utf-8")
+    return resp.to_json_string()
+
+
+# 客户端按(地域, 凭据)缓存复用，以便共享SDK内部的连接
+@lru_cache(maxsize=64)
+def _get_tke_client(region: str, secret_id: str, secret_key: str, version: str = "2018"):
+    """获取TKE客户端，version为"2022"时使用v20220501版本接口"""
+    if version == "2022":
+        client_cls = tke_client_2022.TkeClient
+    else:
+        client_cls = tke_client.TkeClient
+    cred = credential.Credential(secret_id, secret_key)
+    return client_cls(cred, region, _CLIENT_PROFILES["tke"])
+
+
+@lru_cache(maxsize=64)
+def _get_monitor_client(region: str, secret_id: str, secret_key: str):
+    """获取云监控客户端"""
+    cred = credential.Credential(secret_id, secret_key)
+    return monitor_client.MonitorClient(cred, region, _CLIENT_PROFILES["monitor"])
+
+
+@lru_cache(maxsize=64)
+def _get_cls_client(region: str, secret_id: str, secret_key: str):
+    """获取日志服务客户端"""
+    cred = credential.Credential(secret_id, secret_key)
+    return cls_client.ClsClient(cred, region, _CLIENT_PROFILES["cls"])
+
+
+# 单个接口允许的最大并发调用数
+_MAX_CONCURRENCY = 8
+
+
+class _AdaptiveLimiter:
+    """
+    接口级AIMD自适应并发限制。
+
+    触发腾讯云限频(RequestLimitExceeded)时并发上限减半，
+    调用成功时并发上限加0.5，直到恢复为最大并发数。
+    """
+
+    def __init__(self, max_concurrency: int = _MAX_CONCURRENCY):
+        self._max = float(max_concurrency)
+        self._limit = float(max_concurrency)
+        self._inflight = 0
+        self._cond = asyncio.Condition()
+
+    async def __aenter__(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._inflight < int(self._limit))
+            self._inflight += 1
+
+    async def __aexit__(self, exc_type, exc, tb):
+        async with self._cond:
+            self._inflight -= 1
+            if exc is None:
+                self._limit = min(self._max, self._limit + 0.5)
+            elif isinstance(exc, TencentCloudSDKException) and str(
+                getattr(exc, "code", "")
+            ).startswith("RequestLimitExceeded"):
+                self._limit = max(1.0, self._limit * 0.5)
+            self._cond.notify_all()
+        return False
+
+
+_LIMITERS = {}
+
+
+def _get_limiter(action: str) -> _AdaptiveLimiter:
+    """获取接口对应的并发限制器"""
+    limiter = _LIMITERS.get(action)
+    if limiter is None:
+        limiter = _LIMITERS[action] = _AdaptiveLimiter()
+    return limiter
+
+
+def _tc_tool(error_prefix: str = "执行时发生错误"):
+    """
+    统一处理腾讯云工具的异常，转换为ToolError。
+
+    Args:
+        error_prefix: 非SDK异常时错误信息的前缀
+    """
+
+    def decorator(fn):
+        @wraps(fn)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await fn(*args, **kwargs)
+            except ToolError:
+                raise
+            except TencentCloudSDKException as e:
+                raise ToolError(f"腾讯云API调用失败: {str(e)}")
+            except Exception as e:
+                raise ToolError(f"{error_prefix}: {str(e)}")
+
+        return wrapper
+
+    return decorator
+
+
+async def _send(client, action: str, req, raw: bool = False):
+    """在线程中执行SDK调用，受接口级并发限制"""
+    async with _get_limiter(action):
+        if raw:
+            return await asyncio.to_thread(
+                client.call, action, req._serialize(), headers=req.headers
+            )
+        return await asyncio.to_thread(getattr(client, action), req)
+
+
+# 只读接口前缀，只有这些接口的并发相同请求会被合并
+_READ_ONLY_PREFIXES = ("Describe", "List", "Search", "Get")
+
+_INFLIGHT = {}
+
+
+def _request_key(req) -> str:
+    """将请求参数序列化为稳定的字符串，用于识别相同请求"""
+    return json.dumps(req._serialize(), sort_keys=True, default=str)
+
+
+def _forget_inflight(key, task):
+    """在途调用结束后移除记录"""
+    if _INFLIGHT.get(key) is task:
+        del _INFLIGHT[key]
+    # 取出异常，避免所有调用方都已取消时出现未获取异常的警告
+    if not task.cancelled():
+        task.exception()
+
+
+async def _invoke(get_client, client_args: tuple, action: str, req, raw: bool = False):
+    """
+    在线程中调用腾讯云接口并返回SDK响应对象，并发的相同只读请求共享同一次调用。
+
+    Args:
+        get_client: 客户端工厂，如_get_tke_client
+        client_args: 传给客户端工厂的参数
+        action: 接口名称，如DescribeClusters
+        req: 已填充参数的请求对象
+        raw: 为True时返回原始响应体，不构造SDK响应对象
+
+    Raises:
+        TencentCloudSDKException: API调用失败，由_tc_tool转换为ToolError
+    """
+    client = get_client(*client_args)
+    if not action.startswith(_READ_ONLY_PREFIXES):
+        return await _send(client, action, req, raw)
+
+    # 相同的只读请求在途时直接等待同一个调用，
+    # shield避免单个调用方取消时连带取消共享的调用
+    key = (get_client, client_args, action, raw, _request_key(req))
+    task = _INFLIGHT.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_send(client, action, req, raw))
+        _INFLIGHT[key] = task
+        task.add_done_callback(partial(_forget_inflight, key))
+    return await asyncio.shield(task)
+
+
+# 列表类只读接口的结果短时间内变化很小，缓存其JSON结果以合并突发的重复查询
+_TTL_CACHED_ACTIONS = frozenset(
+    {
+        "DescribeClusters",
+        "DescribeClusterStatus",
+        "DescribeNodePools",
+        "DescribeLogsets",
+        "DescribeTopics",
+    }
+)
+
+
+class _TtlCache:
+    """带过期时间的LRU缓存"""
+
+    def __init__(self, ttl: float, maxsize: int):
+        self._ttl = ttl
+        self._maxsize = maxsize
+        self._data = OrderedDict()
+
+    def get(self, key):
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key, value):
+        self._data[key] = (time.monotonic() + self._ttl, value)
+        self._data.move_to_end(key)
+        if len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+
+
+def _ttl_cache(ttl: float = 10.0, maxsize: int = 256):
+    """为_call_*函数缓存_TTL_CACHED_ACTIONS中接口的结果，其余接口直接调用"""
+
+    def decorator(fn):
+        cache = _TtlCache(ttl, maxsize)
+
+        @wraps(fn)
+        async def wrapper(region, secret_id, secret_key, action, req, *args, **kwargs):
+            if action not in _TTL_CACHED_ACTIONS:
+                return await fn(
+                    region, secret_id, secret_key, action, req, *args, **kwargs
+                )
+            key = (
+                region,
+                secret_id,
+                secret_key,
+                action,
+                args,
+                tuple(sorted(kwargs.items())),
+                _request_key(req),
+            )
+            result = cache.get(key)
+            if result is None:
+                result = await fn(
+                    region, secret_id, secret_key, action, req, *args, **kwargs
+                )
+                cache.set(key, result)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+async def _invoke_tke(
+    region: str,
+    secret_id: str,
+    secret_key: str,
+    action: str,
+    req,
+    version: str = "2018",
+):
+    """调用TKE接口并返回SDK响应对象，version可选"2018"或"2022"。"""
+    return await _invoke(
+        _get_tke_client, (region, secret_id, secret_key, version), action, req
+    )
+
+
+@_ttl_cache()
+async def _call_tke(
+    region: str,
+    secret_id: str,
+    secret_key: str,
+    action: str,
+    req,
+    version: str = "2018",
+) -> str:
+    """调用TKE接口并返回JSON格式的响应，参数同_invoke_tke"""
+    resp = await _invoke_tke(region, secret_id, secret_key, action, req, version)
+    return _dump(resp)
+
+
+async def _call_monitor(
+    region: str, secret_id: str, secret_key: str, action: str, req
+) -> str:
+    """调用云监控接口并返回JSON格式的响应"""
+    resp = await _invoke(
+        _get_monitor_client, (region, secret_id, secret_key), action, req
+    )
+    return _dump(resp)
+
+
+@_ttl_cache()
+async def _call_cls(
+    region: str, secret_id: str, secret_key: str, action: str, req
+) -> str:
+    """调用日志服务接口并返回JSON格式的响应"""
+    resp = await _invoke(_get_cls_client, (region, secret_id, secret_key), action, req)
+    return _dump(resp)
+
+
+def _response_text(body) -> str:
+    """
+    解析原始响应体的外层结构，返回Response部分的JSON文本。
+
+    Raises:
+        TencentCloudSDKException: 响应中包含Error时抛出，与SDK的处理一致
+        ValueError: 响应体不是{"Response": {...}}结构
+    """
+    if orjson is not None:
+        envelope = orjson.loads(body)
+    else:
+        envelope = json.loads(body)
+    response = envelope.get("Response") if isinstance(envelope, dict) else None
+    if not isinstance(response, dict):
+        raise ValueError("腾讯云API响应格式异常：缺少Response字段")
+
+    error = response.get("Error")
+    if error:
+        raise TencentCloudSDKException(
+            error.get("Code"), error.get("Message"), response.get("RequestId")
+        )
+
+    if orjson is not None:
+        return orjson.dumps(response).decode("utf-8")
+    return json.dumps(response, ensure_ascii=False)
+
+
+async def _call_cls_raw(
+    region: str, secret_id: str, secret_key: str, action: str, req
+) -> str:
+    """
+    调用日志服务接口并直接返回响应体中的Response部分。
+
+    用于日志检索等大结果集接口，跳过SDK响应对象的构造和逐字段序列化。
+    """
+    body = await _invoke(
+        _get_cls_client, (region, secret_id, secret_key), action, req, raw=True
+    )
+    return _response_text(body)
@@ -2,14 +2,17 @@
 
 import os
 import json
+import sys
 import shutil
 import asyncio
 import threading
 import requests
 import concurrent.futures
 import time
+from collections import Counter, defaultdict
 from contextlib import AsyncExitStack
-from typing import Optional, List, Dict, Any
+from types import MappingProxyType
+from typing import Optional, List, Dict, Any, Set, Tuple, Mapping
 from datetime import timedelta
 from dotenv import load_dotenv
 
@@ -20,7 +23,13 @@ from config.logger import setup_logging
 from core.utils.util import sanitize_tool_name
 
 # 引入告警队列管理器
-from core.services.cluster_alert_queue import alert_queue_manager
+from core.services.cluster_alert_queue import get_alert_queue_manager
+
+# orjson解析/序列化更快，未安装时回退到标准库json
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # 引入腾讯云SDK
 try:
@@ -37,6 +46,74 @@ TAG = __name__
 
 load_dotenv()
 
+# 可注入参数视为“未填写”的占位值
+_PLACEHOLDERS = frozenset({
+    "", None,
+    "your_device_id", "<your_device_id>",
+    "your_secret_id", "<your_secret_id>",
+    "your_secret_key", "<your_secret_key>",
+    "your_region", "<your_region>",
+    "your_agent_model", "<your_agent_model>",
+    "your_agent_api_key", "<your_agent_api_key>",
+})
+
+# region未提供有效值时使用的默认地域
+_DEFAULT_REGION = "ap-guangzhou"
+
+
+# 合并后的子进程环境变量缓存，按配置中的env区分；os.environ条目数变化时整体失效
+_merged_env_cache: Dict[tuple, Dict[str, str]] = {}
+_merged_env_environ_size = -1
+
+
+def _get_merged_env(extra_env: Dict[str, str]) -> Dict[str, str]:
+    """获取os.environ与配置env合并后的环境变量，重连时复用同一份结果"""
+    global _merged_env_environ_size
+    if len(os.environ) != _merged_env_environ_size:
+        _merged_env_cache.clear()
+        _merged_env_environ_size = len(os.environ)
+
+    key = tuple(sorted(extra_env.items()))
+    env = _merged_env_cache.get(key)
+    if env is None:
+        env = {**os.environ, **extra_env}
+        _merged_env_cache[key] = env
+    return env
+
+
+async def _wait_with_timeout(aw, timeout: float) -> Any:
+    """带超时等待，Python 3.11+ 使用基于单个定时器句柄的asyncio.timeout，3.10回退到asyncio.wait_for"""
+    if sys.version_info >= (3, 11):
+        async with asyncio.timeout(timeout):
+            return await aw
+    return await asyncio.wait_for(aw, timeout)
+
+
+def _write_lines(lines: List[str]) -> None:
+    """将多行输出合并为一次写入并刷新标准输出"""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+
+def _json_dumps(obj: Any) -> str:
+    """序列化为JSON字符串（保留非ASCII字符）"""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, ensure_ascii=False)
+
+
+def _json_loads(data) -> Any:
+    """解析JSON字符串"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _is_placeholder(value: Any) -> bool:
+    """判断参数值是否为空或占位符"""
+    # 非字符串的值（如列表、字典）不可哈希，直接视为有效值
+    return value is None or (isinstance(value, str) and value in _PLACEHOLDERS)
+
 class ServerMCPClient:
     """服务端MCP客户端，用于连接和管理MCP服务"""
 
@@ -50,6 +127,7 @@ class ServerMCPClient:
             secret_key: SECRET Key，用于腾讯云API认证
         """
         self.logger = setup_logging()
+        self._log = self.logger.bind(tag=TAG)
         self.config = config
         self.device_id = device_id
         self.secret_id = secret_id
@@ -58,16 +136,28 @@ class ServerMCPClient:
         # 从.env文件读取智能体配置
         self.agent_model = os.getenv("AGENT_MODEL", "")
         self.agent_api_key = os.getenv("AGENT_API_KEY", "")
+        # 是否在控制台重复打印工具调用日志（默认关闭，日志已记录相同内容）
+        self._debug_print = os.getenv("MCP_DEBUG_PRINT", "").lower() in ("1", "true", "yes")
 
         self._worker_task: Optional[asyncio.Task] = None
         self._alert_polling_task: Optional[asyncio.Task] = None  # 告警轮询任务
         self._ready_evt = asyncio.Event()
         self._shutdown_evt = asyncio.Event()
+        # 连接状态标志，由_worker在会话就绪/结束时维护
+        self._connected = False
 
         self.session: Optional[ClientSession] = None
+        # 会话所在的事件循环，会话创建时记录一次
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
         self.tools: List = []  # 原始工具对象
         self.tools_dict: Dict[str, Any] = {}
         self.name_mapping: Dict[str, str] = {}
+        # 工具定义列表缓存，tools_dict变更时需置为None
+        self._available_tools_cache: Optional[List[Dict[str, Any]]] = None
+        # 每个工具的参数注入计划，注册工具时预先计算
+        self._inject_plan: Dict[str, List[tuple]] = {}
+        # 需要较长超时时间的工具（巡检、智能体类）
+        self._long_timeout_tools: Set[str] = set()
         
         # 集群列表缓存
         self.cluster_list: Optional[List[Dict[str, Any]]] = None
@@ -75,6 +165,21 @@ class ServerMCPClient:
         
         # 简化的集群映射：只保存ID和地域（用于后续快速查询）
         self.cluster_map: Dict[str, str] = {}  # {cluster_id: region}
+        # 集群ID与地域的只读快照，随集群映射一起更新
+        self._cluster_ids: Tuple[str, ...] = ()
+        self._regions: Tuple[str, ...] = ()
+
+        # 集群索引，随集群列表一起构建，避免每次查询都线性扫描
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        self._by_name: Dict[str, Dict[str, Any]] = {}
+        self._by_region: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._running: List[Dict[str, Any]] = []
+        # (小写名称, 小写ID, 集群) 列表，供关键词搜索使用
+        self._search_keys: List[tuple] = []
+
+        # 集群概要统计缓存，集群列表重新获取时标记为脏
+        self._summary_cache: Optional[Dict[str, Any]] = None
+        self._summary_dirty: bool = True
         
         print(f"[MCPClient初始化] config={config}, device_id={device_id}, secret_id={secret_id}, secret_key={secret_key}")
         print(f"[MCPClient初始化] agent_model={self.agent_model}, agent_api_key={'*' * len(self.agent_api_key) if self.agent_api_key else '未设置'}")
@@ -91,37 +196,37 @@ class ServerMCPClient:
         
         # 根据级别选择对应的日志方法
         if level == "error":
-            self.logger.bind(tag=TAG).error(formatted_message)
+            self._log.error(formatted_message)
             # 同时打印到控制台以确保重要消息可见
             print(f"ERROR [{logger_name}]: {message}", flush=True)
         elif level == "warning" or level == "warn":
-            self.logger.bind(tag=TAG).warning(formatted_message)
+            self._log.warning(formatted_message)
             print(f"WARNING [{logger_name}]: {message}", flush=True)
         elif level == "debug":
-            self.logger.bind(tag=TAG).debug(formatted_message)
+            self._log.debug(formatted_message)
             print(f"DEBUG [{logger_name}]: {message}", flush=True)
         else:  # info 或其他级别
-            self.logger.bind(tag=TAG).info(formatted_message)
+            self._log.info(formatted_message)
             print(f"INFO [{logger_name}]: {message}", flush=True)
 
     async def _message_handler(self, message) -> None:
         """处理来自服务端的其他消息"""
         if isinstance(message, Exception):
-            self.logger.bind(tag=TAG).error(f"MCP客户端收到错误消息: {message}")
+            self._log.error(f"MCP客户端收到错误消息: {message}")
             print(f"MCP客户端错误: {message}", flush=True)
             return
         
         # 处理服务端通知
         try:
             if hasattr(message, 'method'):  # 通知消息
-                self.logger.bind(tag=TAG).info(f"收到MCP服务端通知: {message}")
+                self._log.info(f"收到MCP服务端通知: {message}")
                 print(f"MCP服务端通知: {message}", flush=True)
             else:
-                self.logger.bind(tag=TAG).info(f"MCP客户端收到其他消息: {type(message).__name__}")
+                self._log.info(f"MCP客户端收到其他消息: {type(message).__name__}")
         except Exception as e:
-            self.logger.bind(tag=TAG).error(f"处理MCP消息时发生错误: {e}")
+            self._log.error(f"处理MCP消息时发生错误: {e}")
             print(f"处理MCP消息错误: {e}", flush=True)
-            self.logger.bind(tag=TAG).debug(f"消息详情: {message}")
+            self._log.debug(f"消息详情: {message}")
             print(f"MCP消息 [{type(message).__name__}]: {message}", flush=True)
 
     async def initialize(self):
@@ -130,21 +235,21 @@ class ServerMCPClient:
             return
 
         print("正在初始化MCP客户端连接...", flush=True)
-        self.logger.bind(tag=TAG).info("开始初始化MCP客户端")
+        self._log.info("开始初始化MCP客户端")
         
         # 重新从.env文件读取智能体配置，确保获取最新值
         self.agent_model = os.getenv("AGENT_MODEL", "")
         self.agent_api_key = os.getenv("AGENT_API_KEY", "")
         
         print(f"[MCPClient初始化] 重新读取配置 - agent_model={self.agent_model}, agent_api_key={'*' * len(self.agent_api_key) if self.agent_api_key else '未设置'}")
-        self.logger.bind(tag=TAG).info(f"初始化时读取智能体配置 - model: {self.agent_model}, api_key: {'*' * len(self.agent_api_key) if self.agent_api_key else '未设置'}")
+        self._log.info(f"初始化时读取智能体配置 - model: {self.agent_model}, api_key: {'*' * len(self.agent_api_key) if self.agent_api_key else '未设置'}")
 
         self._worker_task = asyncio.create_task(
             self._worker(), name="ServerMCPClientWorker"
         )
         await self._ready_evt.wait()
 
-        self.logger.bind(tag=TAG).info(
+        self._log.info(
             f"服务端MCP客户端已连接，可用工具: {[name for name in self.name_mapping.values()]}"
         )
         
@@ -156,7 +261,7 @@ class ServerMCPClient:
         print(f"   - agent_model: {self.agent_model}", flush=True)
         print(f"   - agent_api_key: {'*' * len(self.agent_api_key) if self.agent_api_key else '未设置'}", flush=True)
         
-        self.logger.bind(tag=TAG).info(f"MCP客户端参数 - device_id: {self.device_id}, secret_id: {self.secret_id}, secret_key: {self.secret_key[:8] + '...' if self.secret_key else None}, agent_model: {self.agent_model}, agent_api_key: {'*' * len(self.agent_api_key) if self.agent_api_key else '未设置'}")
+        self._log.info(f"MCP客户端参数 - device_id: {self.device_id}, secret_id: {self.secret_id}, secret_key: {self.secret_key[:8] + '...' if self.secret_key else None}, agent_model: {self.agent_model}, agent_api_key: {'*' * len(self.agent_api_key) if self.agent_api_key else '未设置'}")
         
         # 延迟启动告警轮询消费任务，避免与主连接初始化产生资源竞争
         asyncio.create_task(self._delayed_start_alert_polling(), name=f"DelayedAlertPollingStarter-{id(self)}")
@@ -203,7 +308,7 @@ class ServerMCPClient:
                                 
                         except Exception as notify_error:
                             print(f"发送分析结果失败: {notify_error}", flush=True)
-                            self.logger.bind(tag=TAG).warning(f"发送分析结果失败: {notify_error}")
+                            self._log.warning(f"发送分析结果失败: {notify_error}")
                     else:
                         print(f"无法发送分析结果：设备ID未设置", flush=True)
                 else:
@@ -223,7 +328,7 @@ class ServerMCPClient:
                     
             except Exception as analysis_error:
                 print(f"自动智能分析失败: {analysis_error}", flush=True)
-                self.logger.bind(tag=TAG).warning(f"自动智能分析失败: {analysis_error}")
+                self._log.warning(f"自动智能分析失败: {analysis_error}")
                 
                 # 分析失败时也要通知用户
                 if self.device_id:
@@ -285,7 +390,7 @@ class ServerMCPClient:
             print(f"原始数据报文: {raw_alert}", flush=True)
             
             # 记录到日志
-            self.logger.bind(tag=TAG).info(f"[MCP客户端] 处理集群告警 - 集群: {cluster_id}")
+            self._log.info(f"[MCP客户端] 处理集群告警 - 集群: {cluster_id}")
             
             # 立即发送"正在分析"通知
             if self.device_id:
@@ -309,7 +414,7 @@ class ServerMCPClient:
                         
                 except Exception as notify_error:
                     print(f"发送立即通知失败: {notify_error}", flush=True)
-                    self.logger.bind(tag=TAG).warning(f"发送立即通知失败: {notify_error}")
+                    self._log.warning(f"发送立即通知失败: {notify_error}")
             
             # 在后台线程中异步执行告警分析任务
             alert_analysis_thread = threading.Thread(
@@ -325,7 +430,7 @@ class ServerMCPClient:
             print(f"告警分析任务已启动，集群: {cluster_id}，设备ID: {self.device_id}，线程: {alert_analysis_thread.name}")
             
         except Exception as e:
-            self.logger.bind(tag=TAG).error(f"[MCP客户端] 处理集群告警时发生错误: {e}")
+            self._log.error(f"[MCP客户端] 处理集群告警时发生错误: {e}")
             print(f"ERROR: [MCP客户端] 处理告警失败: {e}", flush=True)
 
     async def _cache_alert_context(self, cluster_id: str, raw_alert: dict, analysis_result: str):
@@ -393,7 +498,7 @@ class ServerMCPClient:
             
         except Exception as e:
             print(f"缓存告警上下文失败: {e}")
-            self.logger.bind(tag=TAG).warning(f"缓存告警上下文失败: {e}")
+            self._log.warning(f"缓存告警上下文失败: {e}")
 
     def get_cached_alert_context(self) -> dict:
         """获取缓存的告警上下文信息"""
@@ -429,7 +534,7 @@ class ServerMCPClient:
         """
         try:
             print(f"[智能分析] 开始智能处理集群 {cluster_id} 的告警...", flush=True)
-            self.logger.bind(tag=TAG).info(f"开始智能告警处理 - 集群: {cluster_id}")
+            self._log.info(f"开始智能告警处理 - 集群: {cluster_id}")
             
             # 调用智能分析
             analysis_result = await self.analyze_alert_with_agent(cluster_id, alert_data, send_notification)
@@ -473,7 +578,7 @@ class ServerMCPClient:
                             
                     except Exception as notify_error:
                         print(f"发送通知失败: {notify_error}", flush=True)
-                        self.logger.bind(tag=TAG).warning(f"发送智能分析通知失败: {notify_error}")
+                        self._log.warning(f"发送智能分析通知失败: {notify_error}")
                 
             else:
                 print(f"智能分析未成功: {analysis_result}", flush=True)
@@ -483,7 +588,7 @@ class ServerMCPClient:
         except Exception as e:
             error_msg = f"智能告警处理失败: {str(e)}"
             print(f"错误: {error_msg}", flush=True)
-            self.logger.bind(tag=TAG).error(f"智能告警处理失败 - 集群: {cluster_id}, 错误: {e}")
+            self._log.error(f"智能告警处理失败 - 集群: {cluster_id}, 错误: {e}")
             return error_msg
 
     async def _send_direct_notification(self, device_id: str, message: str, notification_type: str = "info") -> str:
@@ -512,29 +617,29 @@ class ServerMCPClient:
             if response.status_code == 200:
                 result = f"直接通知发送成功到设备 {device_id}: [{notification_type}] {message[:50]}..."
                 print(f"设备通知: {result}", flush=True)
-                self.logger.bind(tag=TAG).info(result)
+                self._log.info(result)
                 return result
             else:
                 error_msg = f"HTTP {response.status_code}: {response.text}"
                 result = f"直接通知发送失败: {error_msg}"
                 print(f"错误: {result}", flush=True)
-                self.logger.bind(tag=TAG).error(result)
+                self._log.error(result)
                 return result
 
         except requests.exceptions.Timeout:
             result = "直接通知发送超时"
             print(f"错误: {result}", flush=True)
-            self.logger.bind(tag=TAG).error(result)
+            self._log.error(result)
             return result
         except requests.exceptions.ConnectionError:
             result = "直接通知发送连接失败"
             print(f"错误: {result}", flush=True)
-            self.logger.bind(tag=TAG).error(result)
+            self._log.error(result)
             return result
         except Exception as e:
             result = f"直接通知发送异常: {str(e)}"
             print(f"错误: {result}", flush=True)
-            self.logger.bind(tag=TAG).error(result)
+            self._log.error(result)
             return result
 
     async def _send_ai_request(self, device_id: str, request: str, notification_type: str = "info") -> str:
@@ -563,29 +668,29 @@ class ServerMCPClient:
             if response.status_code == 200:
                 result = f"AI请求发送成功到设备 {device_id}: {request[:50]}..."
                 print(f"{result}", flush=True)
-                self.logger.bind(tag=TAG).info(result)
+                self._log.info(result)
                 return result
             else:
                 error_msg = f"HTTP {response.status_code}: {response.text}"
                 result = f"AI请求发送失败: {error_msg}"
                 print(f"错误: {result}", flush=True)
-                self.logger.bind(tag=TAG).error(result)
+                self._log.error(result)
                 return result
 
         except requests.exceptions.Timeout:
             result = "AI请求发送超时（LLM处理时间较长）"
             print(f"错误: {result}", flush=True)
-            self.logger.bind(tag=TAG).error(result)
+            self._log.error(result)
             return result
         except requests.exceptions.ConnectionError:
             result = "AI请求发送连接失败"
             print(f"错误: {result}", flush=True)
-            self.logger.bind(tag=TAG).error(result)
+            self._log.error(result)
             return result
         except Exception as e:
             result = f"AI请求发送异常: {str(e)}"
             print(f"错误: {result}", flush=True)
-            self.logger.bind(tag=TAG).error(result)
+            self._log.error(result)
             return result
 
     async def analyze_alert_with_agent(self, cluster_id: str, alert_data: dict, send_notification: bool = True) -> str:
@@ -601,7 +706,7 @@ class ServerMCPClient:
         """
         try:
             print(f"开始使用智能体分析集群 {cluster_id} 的告警...", flush=True)
-            self.logger.bind(tag=TAG).info(f"开始智能体告警分析 - 集群: {cluster_id}")
+            self._log.info(f"开始智能体告警分析 - 集群: {cluster_id}")
             
             # 检查必要的配置
             if not self.secret_id or not self.secret_key:
@@ -649,14 +754,14 @@ class ServerMCPClient:
             result = await agent.analyze_specific_alert(cluster_id, alert_data)
             
             print(f"智能体告警分析完成", flush=True)
-            self.logger.bind(tag=TAG).info(f"智能体告警分析完成 - 集群: {cluster_id}")
+            self._log.info(f"智能体告警分析完成 - 集群: {cluster_id}")
             
             return result
             
         except Exception as e:
             error_msg = f"智能体告警分析失败: {str(e)}"
             print(f"错误: {error_msg}", flush=True)
-            self.logger.bind(tag=TAG).error(f"智能体告警分析失败 - 集群: {cluster_id}, 错误: {e}")
+            self._log.error(f"智能体告警分析失败 - 集群: {cluster_id}, 错误: {e}")
             return error_msg
 
     async def _delayed_start_alert_polling(self):
@@ -674,11 +779,11 @@ class ServerMCPClient:
                 self._alert_polling_worker(), name=f"AlertPollingWorker-{id(self)}"
             )
             
-            self.logger.bind(tag=TAG).info("延迟启动告警轮询消费者成功")
+            self._log.info("延迟启动告警轮询消费者成功")
             print("延迟启动告警轮询消费者成功", flush=True)
             
         except Exception as e:
-            self.logger.bind(tag=TAG).error(f"延迟启动告警轮询失败: {e}")
+            self._log.error(f"延迟启动告警轮询失败: {e}")
             print(f"延迟启动告警轮询失败: {e}", flush=True)
 
     async def cleanup(self):
@@ -687,18 +792,19 @@ class ServerMCPClient:
             return
 
         # 告警轮询已改为自动模式，无需手动取消注册
-        self.logger.bind(tag=TAG).info("准备清理MCP客户端资源")
+        self._log.info("准备清理MCP客户端资源")
         print("准备清理MCP客户端资源", flush=True)
 
         # 告警轮询任务将在关闭时自动停止 - 临时注释掉，排查连接断开问题
-        # self.logger.bind(tag=TAG).info("准备停止告警轮询")
+        # self._log.info("准备停止告警轮询")
         # print("准备停止告警轮询", flush=True)
 
+        self._connected = False
         self._shutdown_evt.set()
         try:
             await asyncio.wait_for(self._worker_task, timeout=20)
         except (asyncio.TimeoutError, Exception) as e:
-            self.logger.bind(tag=TAG).error(f"服务端MCP客户端关闭错误: {e}")
+            self._log.error(f"服务端MCP客户端关闭错误: {e}")
         finally:
             self._worker_task = None
             
@@ -710,7 +816,7 @@ class ServerMCPClient:
             except asyncio.CancelledError:
                 pass
             self._alert_polling_task = None
-            self.logger.bind(tag=TAG).info("告警轮询任务已停止")
+            self._log.info("告警轮询任务已停止")
             print("告警轮询任务已停止", flush=True)
 
     async def _alert_polling_worker(self):
@@ -718,19 +824,20 @@ class ServerMCPClient:
         
         每个MCP客户端都会轮询自己负责集群的告警队列，实现自动消费
         """
-        self.logger.bind(tag=TAG).info("告警轮询消费者已启动")
+        self._log.info("告警轮询消费者已启动")
         print(f"DEBUG: 启动告警轮询消费者，MCP客户端实例ID: {id(self)}", flush=True)
+        queue_manager = get_alert_queue_manager()
         
         try:
             while not self._shutdown_evt.is_set():
                 try:
                     # 获取当前客户端负责的集群列表
-                    cluster_ids = list(self.cluster_map.keys()) if self.cluster_map else []
+                    cluster_ids = self._cluster_ids
                     
                     if cluster_ids:
                         # 轮询每个集群的队列
                         for cluster_id in cluster_ids:
-                            alert = await alert_queue_manager.consume_alerts(cluster_id)
+                            alert = queue_manager.pop_nowait(cluster_id)
                             if alert:
                                 # 消费到告警，立即处理
                                 print(f"DEBUG: 客户端 {id(self)} 消费到集群 {cluster_id} 的告警", flush=True)
@@ -740,19 +847,19 @@ class ServerMCPClient:
                         await asyncio.sleep(3)
                         continue
                     
-                    # 短暂休眠，避免过于频繁的轮询
-                    await asyncio.sleep(1)
+                    # 等待负责集群的新告警，超时后重新读取集群列表
+                    await queue_manager.wait_for(cluster_ids, timeout=3)
                     
                 except asyncio.CancelledError:
                     break
                 except Exception as e:
-                    self.logger.bind(tag=TAG).error(f"告警轮询消费过程中发生错误: {e}")
+                    self._log.error(f"告警轮询消费过程中发生错误: {e}")
                     await asyncio.sleep(3)  # 发生错误时等待更长时间
                     
         except asyncio.CancelledError:
             pass
         finally:
-            self.logger.bind(tag=TAG).info("告警轮询消费者已停止")
+            self._log.info("告警轮询消费者已停止")
             print(f"DEBUG: 停止告警轮询消费者，MCP客户端实例ID: {id(self)}", flush=True)
 
     def has_tool(self, name: str) -> bool:
@@ -772,18 +879,46 @@ class ServerMCPClient:
         Returns:
             List[Dict[str, Any]]: 工具定义列表
         """
+        if self._available_tools_cache is None:
+            return self._build_available_tools()
+        return self._available_tools_cache
+
+    def _build_available_tools(self) -> List[Dict[str, Any]]:
+        """根据tools_dict构建工具定义列表"""
         return [
             {
                 "type": "function",
                 "function": {
                     "name": name,
                     "description": tool.description,
-                    "parameters": tool.inputSchema,
+                    "parameters": self._llm_parameters(name, tool.inputSchema),
                 },
             }
             for name, tool in self.tools_dict.items()
         ]
 
+    def _llm_parameters(self, name: str, schema: Any) -> Any:
+        """从提供给大模型的参数定义中去掉调用时总会自动注入的参数（设备ID、凭据等）"""
+        injected = {
+            param
+            for param, _, _, inject_if_missing, _ in self._inject_plan.get(name, ())
+            if inject_if_missing
+        }
+        if not injected or not isinstance(schema, dict):
+            return schema
+
+        parameters = dict(schema)
+        parameters["properties"] = {
+            key: value
+            for key, value in schema.get("properties", {}).items()
+            if key not in injected
+        }
+        if "required" in schema:
+            parameters["required"] = [
+                key for key in schema["required"] if key not in injected
+            ]
+        return parameters
+
     async def call_tool(self, name: str, args: dict) -> Any:
         """调用指定工具
 
@@ -802,155 +937,130 @@ class ServerMCPClient:
 
         real_name = self.name_mapping.get(name, name)
         
-        # 通用参数自动注入功能
-        # 检查工具是否需要我们拥有的参数，如果需要则自动注入
-        if name in self.tools_dict:
-            tool = self.tools_dict[name]
-            tool_schema = tool.inputSchema
-            
-            # 检查工具参数schema中是否包含我们可以注入的参数
-            if tool_schema and isinstance(tool_schema, dict) and "properties" in tool_schema:
-                properties = tool_schema["properties"]
-                self.logger.bind(tag=TAG).debug(f"工具 {name} 的参数schema: {properties.keys()}")
-                
-                # 自动注入device_id参数
-                if "device_id" in properties and self.device_id:
-                    if "device_id" in args:
-                        # 如果传入了device_id参数，检查是否为占位符或错误值
-                        original_device_id = args["device_id"]
-                        if original_device_id in ["<your_device_id>", "your_device_id", "", None] or original_device_id != self.device_id:
-                            args["device_id"] = self.device_id
-                            self.logger.bind(tag=TAG).info(f"修正device_id参数: {original_device_id} -> {self.device_id}")
-                            print(f"修正device_id参数: {original_device_id} -> {self.device_id}", flush=True)
-                        else:
-                            self.logger.bind(tag=TAG).debug(f"device_id参数值正确，无需修正: {self.device_id}")
-                    else:
-                        # 如果没有传入device_id参数，自动添加
-                        args["device_id"] = self.device_id
-                        self.logger.bind(tag=TAG).info(f"自动添加device_id参数: {self.device_id}")
-                        print(f"自动添加device_id参数: {self.device_id}", flush=True)
-                
-                # 自动注入或替换secret_id参数
-                if "secret_id" in properties and self.secret_id:
-                    # 检查是否存在占位符值或空值，如果是则替换
-                    if "secret_id" not in args or args["secret_id"] in ["your_secret_id", "<your_secret_id>", "", None]:
-                        original_value = args.get("secret_id", "未设置")
-                        args["secret_id"] = self.secret_id
-                        self.logger.bind(tag=TAG).info(f"注入secret_id参数: {original_value} -> {self.secret_id}")
-                        print(f"注入secret_id参数: {original_value} -> {self.secret_id}", flush=True)
-                
-                # 自动注入或替换secret_key参数
-                if "secret_key" in properties and self.secret_key:
-                    # 检查是否存在占位符值或空值，如果是则替换
-                    if "secret_key" not in args or args["secret_key"] in ["your_secret_key", "<your_secret_key>", "", None]:
-                        original_value = args.get("secret_key", "未设置")
-                        args["secret_key"] = self.secret_key
-                        self.logger.bind(tag=TAG).info(f"注入secret_key参数: {original_value} -> {self.secret_key[:8]}...")
-                        print(f"注入secret_key参数: {original_value} -> {self.secret_key[:8]}...", flush=True)
-                
-                # 自动注入或替换region参数（如果没有提供有效值）
-                if "region" in properties and "region" in args and args["region"] in ["your_region", "<your_region>", "", None]:
-                    # 使用默认的广州区域
-                    original_value = args["region"]
-                    args["region"] = "ap-guangzhou"
-                    self.logger.bind(tag=TAG).info(f"注入region参数: {original_value} -> ap-guangzhou")
-                    print(f"注入region参数: {original_value} -> ap-guangzhou", flush=True)
-                
-                # 自动注入或替换agent_model参数
-                if "agent_model" in properties and self.agent_model:
-                    # 检查是否存在占位符值或空值，如果是则替换
-                    if "agent_model" not in args or args["agent_model"] in ["your_agent_model", "<your_agent_model>", "", None]:
-                        original_value = args.get("agent_model", "未设置")
-                        args["agent_model"] = self.agent_model
-                        self.logger.bind(tag=TAG).info(f"注入agent_model参数: {original_value} -> {self.agent_model}")
-                        print(f"注入agent_model参数: {original_value} -> {self.agent_model}", flush=True)
-                
-                # 自动注入或替换agent_api_key参数
-                if "agent_api_key" in properties and self.agent_api_key:
-                    # 检查是否存在占位符值或空值，如果是则替换
-                    if "agent_api_key" not in args or args["agent_api_key"] in ["your_agent_api_key", "<your_agent_api_key>", "", None]:
-                        original_value = args.get("agent_api_key", "未设置")
-                        args["agent_api_key"] = self.agent_api_key
-                        self.logger.bind(tag=TAG).info(f"注入agent_api_key参数: {original_value} -> {self.agent_api_key[:8]}...")
-                        print(f"注入agent_api_key参数: {original_value} -> {self.agent_api_key[:8]}...", flush=True)
+        # 通用参数自动注入：按注册工具时预先计算的注入计划替换缺失值或占位符
+        for param, value, only_placeholder, inject_if_missing, display in self._inject_plan.get(name, ()):
+            if param in args:
+                original_value = args[param]
+                if original_value == value:
+                    continue
+                # only_placeholder为False表示任何不一致的值都要修正（device_id）
+                if only_placeholder and not _is_placeholder(original_value):
+                    continue
+            elif inject_if_missing:
+                original_value = "未设置"
+            else:
+                continue
+
+            args[param] = value
+            self._log.opt(lazy=True).info(
+                "注入{}参数: {} -> {}", lambda: param, lambda: original_value, lambda: display
+            )
+            if self._debug_print:
+                print(f"注入{param}参数: {original_value} -> {display}")
         
-        print(f"调用MCP工具: {name} -> {real_name}, 参数: {args}", flush=True)
-        self.logger.bind(tag=TAG).info(f"调用MCP工具: {name} -> {real_name}, 参数: {args}")
+        if self._debug_print:
+            print(f"调用MCP工具: {name} -> {real_name}, 参数: {args}")
+        self._log.opt(lazy=True).info(
+            "调用MCP工具: {} -> {}, 参数: {}", lambda: name, lambda: real_name, lambda: args
+        )
         
-        loop = self._worker_task.get_loop()
+        loop = self._session_loop
         coro = self.session.call_tool(real_name, args)
+        # 对于智能体工具，需要更长的超时时间
+        timeout_seconds = 300.0 if name in self._long_timeout_tools else 120.0
 
         try:
-            # 对于智能体工具，需要更长的超时时间
-            timeout_seconds = 300.0 if 'inspection' in name.lower() or 'agent' in name.lower() else 120.0
-            
+            # 为长时间运行的智能体工具设置300秒超时，其他工具120秒
             if loop is asyncio.get_running_loop():
-                # 为长时间运行的智能体工具设置300秒超时，其他工具120秒
-                result = await asyncio.wait_for(coro, timeout=timeout_seconds)
+                result = await _wait_with_timeout(coro, timeout_seconds)
             else:
+                # 仅当从其他线程的事件循环（如告警分析线程）调用时才跨循环提交
                 fut: concurrent.futures.Future = asyncio.run_coroutine_threadsafe(coro, loop)
-                # 为长时间运行的智能体工具设置300秒超时，其他工具120秒
-                result = await asyncio.wait_for(asyncio.wrap_future(fut), timeout=timeout_seconds)
+                result = await _wait_with_timeout(asyncio.wrap_future(fut), timeout_seconds)
             
-            print(f"MCP工具 {name} 调用成功", flush=True)
-            self.logger.bind(tag=TAG).info(f"MCP工具 {name} 调用成功")
+            if self._debug_print:
+                print(f"MCP工具 {name} 调用成功")
+            self._log.info(f"MCP工具 {name} 调用成功")
             
             # 详细输出调用结果
             if result:
                 if hasattr(result, 'content') and result.content:
                     # 如果结果有content属性，输出其内容
-                    result_content = ""
-                    for content_item in result.content:
-                        if hasattr(content_item, 'text'):
-                            result_content += content_item.text + "\n"
-                        elif hasattr(content_item, 'type') and content_item.type == 'text':
-                            result_content += str(content_item) + "\n"
-                        else:
-                            result_content += str(content_item) + "\n"
+                    parts = [
+                        content_item.text if hasattr(content_item, 'text') else str(content_item)
+                        for content_item in result.content
+                    ]
+                    result_content = "\n".join(parts).strip()
                     
-                    print(f"MCP工具 {name} 返回结果:\n{result_content.strip()}", flush=True)
-                    self.logger.bind(tag=TAG).info(f"MCP工具 {name} 返回结果: {result_content.strip()}")
+                    if self._debug_print:
+                        print(f"MCP工具 {name} 返回结果:\n{result_content}")
+                    self._log.opt(lazy=True).info(
+                        "MCP工具 {} 返回结果: {}", lambda: name, lambda: result_content
+                    )
                 else:
                     # 如果没有content属性，直接输出结果对象
-                    print(f"MCP工具 {name} 返回结果: {result}", flush=True)
-                    self.logger.bind(tag=TAG).info(f"MCP工具 {name} 返回结果: {result}")
+                    if self._debug_print:
+                        print(f"MCP工具 {name} 返回结果: {result}")
+                    self._log.opt(lazy=True).info("MCP工具 {} 返回结果: {}", lambda: name, lambda: result)
             else:
-                print(f"MCP工具 {name} 返回结果为空", flush=True)
-                self.logger.bind(tag=TAG).info(f"MCP工具 {name} 返回结果为空")
+                if self._debug_print:
+                    print(f"MCP工具 {name} 返回结果为空")
+                self._log.info(f"MCP工具 {name} 返回结果为空")
             
-            self.logger.bind(tag=TAG).debug(f"MCP工具 {name} 详细返回结果: {result}")
+            self._log.opt(lazy=True).debug("MCP工具 {} 详细返回结果: {}", lambda: name, lambda: result)
             return result
         except asyncio.TimeoutError:
-            timeout_seconds = 300.0 if 'inspection' in name.lower() or 'agent' in name.lower() else 120.0
             error_msg = f"MCP工具 {name} 执行超时（{timeout_seconds}秒）"
-            print(error_msg, flush=True)
-            self.logger.bind(tag=TAG).error(error_msg)
+            if self._debug_print:
+                print(error_msg)
+            self._log.error(error_msg)
             raise Exception(error_msg)
         except Exception as e:
-            print(f"MCP工具 {name} 调用失败: {e}", flush=True)
-            self.logger.bind(tag=TAG).error(f"MCP工具 {name} 调用失败: {e}")
+            if self._debug_print:
+                print(f"MCP工具 {name} 调用失败: {e}")
+            self._log.error(f"MCP工具 {name} 调用失败: {e}")
             raise
 
+    def _build_inject_plan(self, tool) -> List[tuple]:
+        """根据工具参数schema预先计算需要自动注入的参数
+
+        Args:
+            tool: MCP工具对象
+
+        Returns:
+            List[tuple]: (参数名, 注入值, 是否仅替换占位符, 缺失时是否注入, 日志显示值) 列表
+        """
+        schema = tool.inputSchema
+        if not schema or not isinstance(schema, dict) or "properties" not in schema:
+            return []
+        properties = schema["properties"]
+
+        plan = []
+        # device_id始终以当前设备为准
+        if "device_id" in properties and self.device_id:
+            plan.append(("device_id", self.device_id, False, True, self.device_id))
+        if "secret_id" in properties and self.secret_id:
+            plan.append(("secret_id", self.secret_id, True, True, self.secret_id))
+        if "secret_key" in properties and self.secret_key:
+            plan.append(("secret_key", self.secret_key, True, True, f"{self.secret_key[:8]}..."))
+        # region仅在传入了无效值时替换为默认地域，未传入时不注入
+        if "region" in properties:
+            plan.append(("region", _DEFAULT_REGION, True, False, _DEFAULT_REGION))
+        if "agent_model" in properties and self.agent_model:
+            plan.append(("agent_model", self.agent_model, True, True, self.agent_model))
+        if "agent_api_key" in properties and self.agent_api_key:
+            plan.append(("agent_api_key", self.agent_api_key, True, True, f"{self.agent_api_key[:8]}..."))
+
+        self._log.debug(f"工具 {tool.name} 的参数注入计划: {[item[0] for item in plan]}")
+        return plan
+
     def is_connected(self) -> bool:
         """检查MCP客户端是否连接正常
 
         Returns:
             bool: 如果客户端已连接并正常工作，返回True，否则返回False
         """
-        # 检查工作任务是否存在
-        if self._worker_task is None:
-            return False
-
-        # 检查工作任务是否已经完成或取消
-        if self._worker_task.done():
-            return False
-
-        # 检查会话是否存在
-        if self.session is None:
-            return False
-
-        # 所有检查都通过，连接正常
-        return True
+        return self._connected
 
     async def _worker(self):
         """MCP客户端工作协程"""
@@ -963,7 +1073,7 @@ class ServerMCPClient:
                         if self.config["command"] == "npx"
                         else self.config["command"]
                     )
-                    env = {**os.environ, **self.config.get("env", {})}
+                    env = _get_merged_env(self.config.get("env", {}))
                     params = StdioServerParameters(
                         command=cmd,
                         args=self.config.get("args", []),
@@ -999,47 +1109,59 @@ class ServerMCPClient:
                         logging_callback=self._logging_callback,  # 添加日志回调
                     )
                 )
-                self.logger.bind(tag=TAG).info("MCP客户端会话创建成功，开始初始化...")
+                self._session_loop = asyncio.get_running_loop()
+                self._log.info("MCP客户端会话创建成功，开始初始化...")
                 await self.session.initialize()
-                self.logger.bind(tag=TAG).info("MCP客户端会话初始化完成")
+                self._log.info("MCP客户端会话初始化完成")
 
                 # 获取工具
                 self.tools = (await self.session.list_tools()).tools
-                self.logger.bind(tag=TAG).info(f"获取到 {len(self.tools)} 个工具")
+                self._log.info(f"获取到 {len(self.tools)} 个工具")
                 for t in self.tools:
                     sanitized = sanitize_tool_name(t.name)
                     self.tools_dict[sanitized] = t
                     self.name_mapping[sanitized] = t.name
-                    self.logger.bind(tag=TAG).debug(f"注册工具: {t.name} -> {sanitized}")
+                    self._inject_plan[sanitized] = self._build_inject_plan(t)
+                    sanitized_lower = sanitized.lower()
+                    if 'inspection' in sanitized_lower or 'agent' in sanitized_lower:
+                        self._long_timeout_tools.add(sanitized)
+                    self._log.debug(f"注册工具: {t.name} -> {sanitized}")
+                self._available_tools_cache = self._build_available_tools()
 
                 self._ready_evt.set()
-                self.logger.bind(tag=TAG).info("MCP客户端准备就绪，开始等待关闭信号...")
+                self._connected = True
+                self._log.info("MCP客户端准备就绪，开始等待关闭信号...")
 
                 # 自动获取集群列表（如果提供了腾讯云凭据）
                 await self._auto_fetch_cluster_list()
 
                 # 挂起等待关闭
                 await self._shutdown_evt.wait()
-                self.logger.bind(tag=TAG).info("收到关闭信号，MCP客户端开始清理...")
+                self._connected = False
+                self._log.info("收到关闭信号，MCP客户端开始清理...")
 
             except Exception as e:
-                self.logger.bind(tag=TAG).error(f"服务端MCP客户端工作协程错误: {e}")
+                self._log.error(f"服务端MCP客户端工作协程错误: {e}")
                 self._ready_evt.set()
                 raise
+            finally:
+                self._connected = False
 
     async def _auto_fetch_cluster_list(self):
         """自动获取集群列表（直接调用腾讯云API）"""
         if not self.secret_id or not self.secret_key:
-            self.logger.bind(tag=TAG).info("未提供腾讯云凭据，跳过自动获取集群列表")
+            self._log.info("未提供腾讯云凭据，跳过自动获取集群列表")
             return
         
         if not TENCENT_SDK_AVAILABLE:
-            self.logger.bind(tag=TAG).warning("腾讯云SDK不可用，无法自动获取集群列表")
+            self._log.warning("腾讯云SDK不可用，无法自动获取集群列表")
             print("腾讯云SDK不可用，请安装tencentcloud-sdk-python", flush=True)
             return
             
+        self._summary_dirty = True
+
         try:
-            self.logger.bind(tag=TAG).info("开始自动获取集群列表...")
+            self._log.info("开始自动获取集群列表...")
             print("正在自动获取腾讯云TKE集群列表...", flush=True)
             
             # 直接调用腾讯云API获取集群列表
@@ -1047,25 +1169,28 @@ class ServerMCPClient:
             regions_to_try = ["ap-guangzhou", "ap-shanghai", "ap-beijing", "ap-shenzhen"]
             all_clusters = []
             
-            for region in regions_to_try:
-                try:
-                    clusters = await self._fetch_clusters_from_region(region)
-                    if clusters:
-                        # 为每个集群添加地域信息
-                        for cluster in clusters:
-                            cluster["Region"] = region
-                        all_clusters.extend(clusters)
-                        
-                        self.logger.bind(tag=TAG).info(f"从地域 {region} 获取到 {len(clusters)} 个集群")
-                        print(f"从地域 {region} 获取到 {len(clusters)} 个集群", flush=True)
-                        
-                except Exception as e:
-                    self.logger.bind(tag=TAG).debug(f"获取地域 {region} 集群列表失败: {e}")
+            # 各地域并发查询，总耗时取决于最慢的地域而不是各地域之和
+            results = await asyncio.gather(
+                *[self._fetch_clusters_from_region(region) for region in regions_to_try],
+                return_exceptions=True,
+            )
+
+            for region, clusters in zip(regions_to_try, results):
+                if isinstance(clusters, BaseException):
+                    self._log.debug(f"获取地域 {region} 集群列表失败: {clusters}")
                     continue
+                if clusters:
+                    # 为每个集群添加地域信息
+                    for cluster in clusters:
+                        cluster["Region"] = region
+                    all_clusters.extend(clusters)
+                    
+                    self._log.info(f"从地域 {region} 获取到 {len(clusters)} 个集群")
+                    print(f"从地域 {region} 获取到 {len(clusters)} 个集群", flush=True)
             
             # 存储集群列表
             self.cluster_list = all_clusters
-            self.cluster_list_raw = json.dumps({"Clusters": all_clusters}, ensure_ascii=False)
+            self.cluster_list_raw = _json_dumps({"Clusters": all_clusters})
             
             # 构建简化的集群映射（只保存ID和地域）
             self.cluster_map = {}
@@ -1074,15 +1199,22 @@ class ServerMCPClient:
                 region = cluster.get("Region")
                 if cluster_id and region:
                     self.cluster_map[cluster_id] = region
+            self._cluster_ids = tuple(self.cluster_map)
+            self._regions = tuple(sorted(set(self.cluster_map.values())))
+
+            self._build_cluster_indexes()
+            self._summary_cache = self._compute_cluster_summary()
+            self._summary_dirty = False
             
-            self.logger.bind(tag=TAG).info(f"构建集群映射完成: {self.cluster_map}")
+            self._log.info(f"构建集群映射完成: {self.cluster_map}")
             print(f"集群映射: {self.cluster_map}", flush=True)
             
             if all_clusters:
-                self.logger.bind(tag=TAG).info(f"自动获取集群列表成功，共找到 {len(all_clusters)} 个集群")
+                self._log.info(f"自动获取集群列表成功，共找到 {len(all_clusters)} 个集群")
                 print(f"自动获取集群列表成功，共找到 {len(all_clusters)} 个集群", flush=True)
                 
-                # 打印集群概要信息
+                # 打印集群概要信息（汇总后一次性写出）
+                lines = []
                 for cluster in all_clusters:
                     cluster_id = cluster.get("ClusterId", "Unknown")
                     cluster_name = cluster.get("ClusterName", "Unknown")
@@ -1094,31 +1226,34 @@ class ServerMCPClient:
                     cluster_os = cluster.get("ClusterOs", "Unknown")
                     container_runtime = cluster.get("ContainerRuntime", "Unknown")
                     
-                    print(f"  集群: {cluster_name} ({cluster_id})", flush=True)
-                    print(f"     状态: {cluster_status} | 地域: {cluster_region} | 版本: {cluster_version}", flush=True)
-                    print(f"     类型: {cluster_type} | 节点数: {node_num} | 系统: {cluster_os}", flush=True)
-                    print(f"     容器运行时: {container_runtime}", flush=True)
+                    lines.append(f"  集群: {cluster_name} ({cluster_id})")
+                    lines.append(f"     状态: {cluster_status} | 地域: {cluster_region} | 版本: {cluster_version}")
+                    lines.append(f"     类型: {cluster_type} | 节点数: {node_num} | 系统: {cluster_os}")
+                    lines.append(f"     容器运行时: {container_runtime}")
                     
-                    # 记录详细日志
-                    self.logger.bind(tag=TAG).info(f"集群详情 - 名称: {cluster_name}, ID: {cluster_id}, 状态: {cluster_status}, 地域: {cluster_region}, 版本: {cluster_version}, 节点数: {node_num}")
+                    # 记录详细日志（INFO级别未启用时跳过格式化）
+                    self._log.opt(lazy=True).info(
+                        "{}",
+                        lambda: f"集群详情 - 名称: {cluster_name}, ID: {cluster_id}, 状态: {cluster_status}, 地域: {cluster_region}, 版本: {cluster_version}, 节点数: {node_num}",
+                    )
                     
                     # 如果有网络配置信息，也显示一下
                     if "ClusterNetworkSettings" in cluster:
                         network = cluster["ClusterNetworkSettings"]
                         service_cidr = network.get("ServiceCIDR", "Unknown")
                         vpc_id = network.get("VpcId", "Unknown")
-                        print(f"     网络: VPC({vpc_id}) | 服务CIDR: {service_cidr}", flush=True)
+                        lines.append(f"     网络: VPC({vpc_id}) | 服务CIDR: {service_cidr}")
                 
                 # 告警轮询已在初始化时自动启动，无需注册处理器
-                self.logger.bind(tag=TAG).info(f"集群列表已获取，告警轮询将自动监听 {len(self.cluster_map)} 个集群")
-                print(f"集群列表已获取，告警轮询将自动监听 {len(self.cluster_map)} 个集群", flush=True)
-                print(f"集群列表已获取，告警轮询将自动监听 {len(self.cluster_map)} 个集群", flush=True)
+                self._log.info(f"集群列表已获取，告警轮询将自动监听 {len(self.cluster_map)} 个集群")
+                lines.append(f"集群列表已获取，告警轮询将自动监听 {len(self.cluster_map)} 个集群")
+                _write_lines(lines)
             else:
-                self.logger.bind(tag=TAG).info("未找到任何TKE集群")
+                self._log.info("未找到任何TKE集群")
                 print("信息: 未找到任何TKE集群", flush=True)
                 
         except Exception as e:
-            self.logger.bind(tag=TAG).error(f"自动获取集群列表失败: {e}")
+            self._log.error(f"自动获取集群列表失败: {e}")
             print(f"错误: 自动获取集群列表失败: {e}", flush=True)
 
     async def _fetch_clusters_from_region(self, region: str) -> List[Dict[str, Any]]:
@@ -1131,46 +1266,91 @@ class ServerMCPClient:
             List[Dict[str, Any]]: 集群列表
         """
         try:
-            # 创建腾讯云凭据
-            cred = credential.Credential(self.secret_id, self.secret_key)
+            # SDK调用是同步阻塞的，放到线程池中执行以免阻塞事件循环
+            return await asyncio.get_running_loop().run_in_executor(
+                None, self._describe_clusters_sync, region
+            )
 
-            # 配置HTTP配置
-            httpProfile = HttpProfile()
-            httpProfile.endpoint = "tke.tencentcloudapi.com"
+        except TencentCloudSDKException as e:
+            self._log.debug(f"腾讯云API调用失败 - 地域 {region}: {str(e)}")
+            return []
+        except Exception as e:
+            self._log.debug(f"获取地域 {region} 集群列表时发生错误: {str(e)}")
+            return []
 
-            # 创建客户端配置
-            clientProfile = ClientProfile()
-            clientProfile.httpProfile = httpProfile
+    def _describe_clusters_sync(self, region: str) -> List[Dict[str, Any]]:
+        """同步调用腾讯云DescribeClusters接口（在线程池中执行）
 
-            # 创建TKE客户端
-            client = tke_client.TkeClient(cred, region, clientProfile)
+        Args:
+            region: 地域代码
 
-            # 创建请求
-            req = models_2018.DescribeClustersRequest()
-            params = {}
-            req.from_json_string(json.dumps(params))
+        Returns:
+            List[Dict[str, Any]]: 集群列表
+        """
+        # 创建腾讯云凭据
+        cred = credential.Credential(self.secret_id, self.secret_key)
 
-            # 执行请求
-            resp = client.DescribeClusters(req)
-            
-            # 解析响应
-            response_data = json.loads(resp.to_json_string())
-            
-            # 处理响应结构: Response.Clusters
-            if "Response" in response_data and "Clusters" in response_data["Response"]:
-                return response_data["Response"]["Clusters"]
-            elif "Clusters" in response_data:
-                return response_data["Clusters"]
-            else:
-                return []
+        # 配置HTTP配置
+        httpProfile = HttpProfile()
+        httpProfile.endpoint = "tke.tencentcloudapi.com"
 
-        except TencentCloudSDKException as e:
-            self.logger.bind(tag=TAG).debug(f"腾讯云API调用失败 - 地域 {region}: {str(e)}")
-            return []
-        except Exception as e:
-            self.logger.bind(tag=TAG).debug(f"获取地域 {region} 集群列表时发生错误: {str(e)}")
+        # 创建客户端配置
+        clientProfile = ClientProfile()
+        clientProfile.httpProfile = httpProfile
+
+        # 创建TKE客户端
+        client = tke_client.TkeClient(cred, region, clientProfile)
+
+        # 创建请求
+        req = models_2018.DescribeClustersRequest()
+        params = {}
+        req.from_json_string(json.dumps(params))
+
+        # 执行请求
+        resp = client.DescribeClusters(req)
+        
+        # 解析响应
+        response_data = _json_loads(resp.to_json_string())
+        
+        # 处理响应结构: Response.Clusters
+        if "Response" in response_data and "Clusters" in response_data["Response"]:
+            return response_data["Response"]["Clusters"]
+        elif "Clusters" in response_data:
+            return response_data["Clusters"]
+        else:
             return []
 
+    def _build_cluster_indexes(self):
+        """根据当前集群列表重建ID、名称、地域和运行状态索引"""
+        by_id: Dict[str, Dict[str, Any]] = {}
+        by_name: Dict[str, Dict[str, Any]] = {}
+        by_region: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        running: List[Dict[str, Any]] = []
+        search_keys: List[tuple] = []
+
+        for cluster in self.cluster_list or []:
+            # 与原线性查找保持一致：重复的ID/名称以第一个为准
+            cluster_id = cluster.get("ClusterId")
+            if cluster_id is not None:
+                by_id.setdefault(cluster_id, cluster)
+            cluster_name = cluster.get("ClusterName")
+            if cluster_name is not None:
+                by_name.setdefault(cluster_name, cluster)
+            by_region[cluster.get("Region")].append(cluster)
+            if cluster.get("ClusterStatus") == "Running":
+                running.append(cluster)
+            search_keys.append((
+                cluster.get("ClusterName", "").lower(),
+                cluster.get("ClusterId", "").lower(),
+                cluster,
+            ))
+
+        self._by_id = by_id
+        self._by_name = by_name
+        self._by_region = by_region
+        self._running = running
+        self._search_keys = search_keys
+
     def get_cluster_list(self) -> Optional[List[Dict[str, Any]]]:
         """获取缓存的集群列表
         
@@ -1204,13 +1384,7 @@ class ServerMCPClient:
         Returns:
             Optional[Dict[str, Any]]: 集群信息，如果未找到则返回None
         """
-        if not self.cluster_list:
-            return None
-            
-        for cluster in self.cluster_list:
-            if cluster.get("ClusterId") == cluster_id:
-                return cluster
-        return None
+        return self._by_id.get(cluster_id)
     
     def get_clusters_by_region(self, region: str) -> List[Dict[str, Any]]:
         """根据地域获取集群列表
@@ -1221,10 +1395,7 @@ class ServerMCPClient:
         Returns:
             List[Dict[str, Any]]: 该地域的集群列表
         """
-        if not self.cluster_list:
-            return []
-            
-        return [cluster for cluster in self.cluster_list if cluster.get("Region") == region]
+        return list(self._by_region.get(region, ()))
 
     async def refresh_cluster_list(self) -> bool:
         """手动刷新集群列表
@@ -1236,7 +1407,7 @@ class ServerMCPClient:
             await self._auto_fetch_cluster_list()
             return True
         except Exception as e:
-            self.logger.bind(tag=TAG).error(f"手动刷新集群列表失败: {e}")
+            self._log.error(f"手动刷新集群列表失败: {e}")
             return False
 
     def get_running_clusters(self) -> List[Dict[str, Any]]:
@@ -1245,17 +1416,23 @@ class ServerMCPClient:
         Returns:
             List[Dict[str, Any]]: 运行中的集群列表
         """
-        if not self.cluster_list:
-            return []
-            
-        return [cluster for cluster in self.cluster_list if cluster.get("ClusterStatus") == "Running"]
+        return list(self._running)
 
     def get_cluster_summary(self) -> Dict[str, Any]:
         """获取集群概要统计信息
+
+        统计结果在获取集群列表后计算并缓存，调用方不应修改返回的字典
         
         Returns:
             Dict[str, Any]: 包含各种统计信息的字典
         """
+        if self._summary_dirty or self._summary_cache is None:
+            self._summary_cache = self._compute_cluster_summary()
+            self._summary_dirty = False
+        return self._summary_cache
+
+    def _compute_cluster_summary(self) -> Dict[str, Any]:
+        """根据当前集群列表计算概要统计信息"""
         if not self.cluster_list:
             return {
                 "total_count": 0,
@@ -1266,31 +1443,26 @@ class ServerMCPClient:
                 "total_nodes": 0
             }
         
-        # 统计信息
-        running_clusters = [c for c in self.cluster_list if c.get("ClusterStatus") == "Running"]
-        regions = list(set(c.get("Region", "Unknown") for c in self.cluster_list))
-        
-        # 统计集群类型
-        cluster_types = {}
+        # 单次遍历同时统计运行数、地域、集群类型、K8s版本和节点数
+        running_count = 0
+        regions = set()
+        cluster_types = Counter()
+        k8s_versions = Counter()
+        total_nodes = 0
         for cluster in self.cluster_list:
-            cluster_type = cluster.get("ClusterType", "Unknown")
-            cluster_types[cluster_type] = cluster_types.get(cluster_type, 0) + 1
-        
-        # 统计K8s版本
-        k8s_versions = {}
-        for cluster in self.cluster_list:
-            version = cluster.get("ClusterVersion", "Unknown")
-            k8s_versions[version] = k8s_versions.get(version, 0) + 1
-        
-        # 统计总节点数
-        total_nodes = sum(cluster.get("ClusterNodeNum", 0) for cluster in self.cluster_list)
+            if cluster.get("ClusterStatus") == "Running":
+                running_count += 1
+            regions.add(cluster.get("Region", "Unknown"))
+            cluster_types[cluster.get("ClusterType", "Unknown")] += 1
+            k8s_versions[cluster.get("ClusterVersion", "Unknown")] += 1
+            total_nodes += cluster.get("ClusterNodeNum", 0)
         
         return {
             "total_count": len(self.cluster_list),
-            "running_count": len(running_clusters),
+            "running_count": running_count,
             "regions": sorted(regions),
-            "cluster_types": cluster_types,
-            "k8s_versions": k8s_versions,
+            "cluster_types": dict(cluster_types),
+            "k8s_versions": dict(k8s_versions),
             "total_nodes": total_nodes
         }
 
@@ -1303,13 +1475,7 @@ class ServerMCPClient:
         Returns:
             Optional[Dict[str, Any]]: 集群信息，如果未找到则返回None
         """
-        if not self.cluster_list:
-            return None
-            
-        for cluster in self.cluster_list:
-            if cluster.get("ClusterName") == cluster_name:
-                return cluster
-        return None
+        return self._by_name.get(cluster_name)
 
     def search_clusters(self, keyword: str) -> List[Dict[str, Any]]:
         """根据关键词搜索集群（搜索名称和ID）
@@ -1320,20 +1486,15 @@ class ServerMCPClient:
         Returns:
             List[Dict[str, Any]]: 匹配的集群列表
         """
-        if not self.cluster_list or not keyword:
+        if not keyword:
             return []
         
         keyword_lower = keyword.lower()
-        matched_clusters = []
-        
-        for cluster in self.cluster_list:
-            cluster_name = cluster.get("ClusterName", "").lower()
-            cluster_id = cluster.get("ClusterId", "").lower()
-            
-            if keyword_lower in cluster_name or keyword_lower in cluster_id:
-                matched_clusters.append(cluster)
-        
-        return matched_clusters
+        return [
+            cluster
+            for cluster_name, cluster_id, cluster in self._search_keys
+            if keyword_lower in cluster_name or keyword_lower in cluster_id
+        ]
 
     def print_cluster_summary(self):
         """打印集群概要信息到控制台"""
@@ -1343,33 +1504,37 @@ class ServerMCPClient:
         
         summary = self.get_cluster_summary()
         
-        print(f"\n集群概要统计:", flush=True)
-        print(f"  总集群数: {summary['total_count']}", flush=True)
-        print(f"  运行中: {summary['running_count']}", flush=True)
-        print(f"  总节点数: {summary['total_nodes']}", flush=True)
-        print(f"  覆盖地域: {', '.join(summary['regions'])}", flush=True)
+        lines = [
+            f"\n集群概要统计:",
+            f"  总集群数: {summary['total_count']}",
+            f"  运行中: {summary['running_count']}",
+            f"  总节点数: {summary['total_nodes']}",
+            f"  覆盖地域: {', '.join(summary['regions'])}",
+        ]
         
         if summary['cluster_types']:
-            print(f"  集群类型分布:", flush=True)
+            lines.append(f"  集群类型分布:")
             for cluster_type, count in summary['cluster_types'].items():
-                print(f"    - {cluster_type}: {count}个", flush=True)
+                lines.append(f"    - {cluster_type}: {count}个")
         
         if summary['k8s_versions']:
-            print(f"  K8s版本分布:", flush=True)
+            lines.append(f"  K8s版本分布:")
             for version, count in summary['k8s_versions'].items():
-                print(f"    - {version}: {count}个", flush=True)
+                lines.append(f"    - {version}: {count}个")
+
+        _write_lines(lines)
 
     # ==========================================
     # 简化集群映射访问方法
     # ==========================================
 
-    def get_cluster_map(self) -> Dict[str, str]:
-        """获取集群ID到地域的映射
+    def get_cluster_map(self) -> Mapping[str, str]:
+        """获取集群ID到地域的映射（只读视图）
         
         Returns:
-            Dict[str, str]: {cluster_id: region} 映射字典
+            Mapping[str, str]: {cluster_id: region} 只读映射
         """
-        return self.cluster_map.copy() if self.cluster_map else {}
+        return MappingProxyType(self.cluster_map)
 
     def get_cluster_region(self, cluster_id: str) -> Optional[str]:
         """根据集群ID获取地域
@@ -1382,23 +1547,21 @@ class ServerMCPClient:
         """
         return self.cluster_map.get(cluster_id)
 
-    def get_cluster_ids(self) -> List[str]:
-        """获取所有集群ID列表
+    def get_cluster_ids(self) -> Tuple[str, ...]:
+        """获取所有集群ID
         
         Returns:
-            List[str]: 集群ID列表
+            Tuple[str, ...]: 集群ID元组
         """
-        return list(self.cluster_map.keys()) if self.cluster_map else []
+        return self._cluster_ids
 
-    def get_regions(self) -> List[str]:
-        """获取所有地域列表（去重）
+    def get_regions(self) -> Tuple[str, ...]:
+        """获取所有地域（去重并排序）
         
         Returns:
-            List[str]: 地域列表
+            Tuple[str, ...]: 地域元组
         """
-        if not self.cluster_map:
-            return []
-        return list(set(self.cluster_map.values()))
+        return self._regions
 
     def get_clusters_in_region(self, region: str) -> List[str]:
         """获取指定地域的所有集群ID
@@ -1430,14 +1593,16 @@ class ServerMCPClient:
             print("暂无集群映射信息", flush=True)
             return
         
-        print(f"\n集群映射 (共{len(self.cluster_map)}个):", flush=True)
+        lines = [f"\n集群映射 (共{len(self.cluster_map)}个):"]
         for cluster_id, region in self.cluster_map.items():
-            print(f"  - {cluster_id} → {region}", flush=True)
+            lines.append(f"  - {cluster_id} → {region}")
         
         # 按地域分组显示
         regions = self.get_regions()
         if len(regions) > 1:
-            print(f"\n按地域分组:", flush=True)
-            for region in sorted(regions):
+            lines.append(f"\n按地域分组:")
+            for region in regions:
                 cluster_ids = self.get_clusters_in_region(region)
-                print(f"  {region}: {len(cluster_ids)}个集群 {cluster_ids}", flush=True)
+                lines.append(f"  {region}: {len(cluster_ids)}个集群 {cluster_ids}")
+
+        _write_lines(lines)
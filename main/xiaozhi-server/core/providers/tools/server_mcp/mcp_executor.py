@@ -1,11 +1,46 @@
 """服务端MCP工具执行器"""
 
-from typing import Dict, Any, Optional, List
+import asyncio
+import json
+from typing import Dict, Any, Optional, List, Tuple
 from ..base import ToolType, ToolDefinition, ToolExecutor
 from plugins_func.register import Action, ActionResponse
 from .mcp_manager import ServerMCPManager
 from config.logger import setup_logging
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+TAG = __name__
+logger = setup_logging()
+
+# 未初始化时返回的共享空工具字典（调用方只读）
+_EMPTY_TOOLS: Dict[str, ToolDefinition] = {}
+
+
+def _result_to_text(result: Any) -> str:
+    """将工具返回结果转换为文本，字符串直接透传，避免重复拷贝"""
+    if isinstance(result, str):
+        return result
+    if isinstance(result, (bytes, bytearray)):
+        return bytes(result).decode("utf-8", "replace")
+    # MCP CallToolResult：直接取出文本内容，避免对整个结果对象做repr转换
+    content = getattr(result, "content", None)
+    if isinstance(content, list) and content:
+        return "\n".join(
+            item.text if hasattr(item, "text") else str(item) for item in content
+        )
+    if isinstance(result, (dict, list)):
+        try:
+            if orjson is not None:
+                return orjson.dumps(result).decode("utf-8")
+            return json.dumps(result, ensure_ascii=False)
+        except (TypeError, ValueError):
+            pass
+    return str(result)
+
 
 class ServerMCPExecutor(ToolExecutor):
     """服务端MCP工具执行器"""
@@ -25,11 +60,19 @@ class ServerMCPExecutor(ToolExecutor):
         self.secret_key = secret_key
         self.mcp_manager: Optional[ServerMCPManager] = None
         self._initialized = False
-        self.logger = setup_logging()
+        self._init_lock = asyncio.Lock()
+        # get_tools结果缓存，按MCP管理器的工具版本号失效
+        self._tools_cache: Optional[Dict[str, ToolDefinition]] = None
+        self._tools_cache_version = -1
 
     async def initialize(self):
         """初始化MCP管理器"""
-        if not self._initialized:
+        if self._initialized:
+            return
+        # 加锁并二次检查，避免并发调用时重复初始化
+        async with self._init_lock:
+            if self._initialized:
+                return
             self.mcp_manager = ServerMCPManager(self.conn, self.device_id, self.secret_id, self.secret_key)
             await self.mcp_manager.initialize_servers()
             self._initialized = True
@@ -45,37 +88,80 @@ class ServerMCPExecutor(ToolExecutor):
             )
 
         try:
-            # 移除mcp_前缀（如果有）
-            actual_tool_name = tool_name
-            if tool_name.startswith("mcp_"):
-                actual_tool_name = tool_name[4:]
-
+            actual_tool_name = self._strip(tool_name)
             result = await self.mcp_manager.execute_tool(actual_tool_name, arguments)
 
-            return ActionResponse(action=Action.REQLLM, result=str(result))
+            return self._result_response(result)
 
-        except ValueError as e:
-            return ActionResponse(
-                action=Action.NOTFOUND,
-                response=str(e),
-            )
         except Exception as e:
+            return self._error_response(e)
+
+    async def execute_batch(
+        self, conn, calls: List[Tuple[str, Dict[str, Any]]]
+    ) -> List[ActionResponse]:
+        """并发执行多个服务端MCP工具调用
+
+        Args:
+            conn: 连接对象
+            calls: (工具名称, 参数) 列表
+
+        Returns:
+            List[ActionResponse]: 与calls顺序一致的执行结果
+        """
+        if not self._initialized or not self.mcp_manager:
+            return [
+                ActionResponse(action=Action.ERROR, response="MCP管理器未初始化")
+                for _ in calls
+            ]
+
+        actual_calls = [(self._strip(tool_name), arguments) for tool_name, arguments in calls]
+        results = await self.mcp_manager.execute_tools(actual_calls)
+        return [
+            self._error_response(result)
+            if isinstance(result, BaseException)
+            else self._result_response(result)
+            for result in results
+        ]
+
+    @staticmethod
+    def _strip(tool_name: str) -> str:
+        """移除工具名称的mcp_前缀（如果有）"""
+        return tool_name.removeprefix("mcp_")
+
+    @classmethod
+    def _result_response(cls, result: Any) -> ActionResponse:
+        """将工具返回结果转换为ActionResponse，isError为True的结果按工具错误处理"""
+        text = _result_to_text(result)
+        if getattr(result, "isError", False) is True:
+            return cls._error_response(RuntimeError(f"工具调用错误: {text}"))
+        return ActionResponse(action=Action.REQLLM, result=text)
+
+    @staticmethod
+    def _error_response(e: BaseException) -> ActionResponse:
+        """将工具执行异常转换为ActionResponse"""
+        if isinstance(e, ValueError):
             return ActionResponse(
-                action=Action.ERROR,
+                action=Action.NOTFOUND,
                 response=str(e),
             )
+        return ActionResponse(
+            action=Action.ERROR,
+            response=str(e),
+        )
 
     def get_tools(self) -> Dict[str, ToolDefinition]:
         """获取所有服务端MCP工具"""
-        self.logger.info(f"ServerMCPExecutor.get_tools 被调用，初始化状态: {self._initialized}")
-        
         if not self._initialized or not self.mcp_manager:
-            self.logger.warning("MCP执行器未初始化或MCP管理器为空")
-            return {}
+            logger.bind(tag=TAG).warning("MCP执行器未初始化或MCP管理器为空")
+            return _EMPTY_TOOLS
+
+        version = self.mcp_manager.tools_version
+        if self._tools_cache is not None and version == self._tools_cache_version:
+            return self._tools_cache
 
         tools = {}
         mcp_tools = self.mcp_manager.get_all_tools()
-        self.logger.info(f"从MCP管理器获取到 {len(mcp_tools)} 个工具")
+        logger.bind(tag=TAG).debug("从MCP管理器获取到 {} 个工具", len(mcp_tools))
 
         for tool in mcp_tools:
             func_def = tool.get("function", {})
@@ -85,9 +171,13 @@ class ServerMCPExecutor(ToolExecutor):
             tools[tool_name] = ToolDefinition(
                 name=tool_name, description=tool, tool_type=ToolType.SERVER_MCP
             )
-            self.logger.debug(f"注册MCP工具: {tool_name}")
+            logger.bind(tag=TAG).debug("注册MCP工具: {}", tool_name)
 
-        self.logger.info(f"ServerMCPExecutor返回 {len(tools)} 个工具: {list(tools.keys())}")
+        logger.bind(tag=TAG).opt(lazy=True).debug(
+            "ServerMCPExecutor返回 {} 个工具: {}", lambda: len(tools), lambda: list(tools)
+        )
+        self._tools_cache = tools
+        self._tools_cache_version = version
         return tools
 
     def has_tool(self, tool_name: str) -> bool:
@@ -95,12 +185,7 @@ class ServerMCPExecutor(ToolExecutor):
         if not self._initialized or not self.mcp_manager:
             return False
 
-        # 移除mcp_前缀（如果有）
-        actual_tool_name = tool_name
-        if tool_name.startswith("mcp_"):
-            actual_tool_name = tool_name[4:]
-
-        return self.mcp_manager.is_mcp_tool(actual_tool_name)
+        return self.mcp_manager.is_mcp_tool(self._strip(tool_name))
 
     async def cleanup(self):
         """清理MCP连接"""
@@ -3,7 +3,7 @@
 import asyncio
 import os
 import json
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 from config.config_loader import get_project_dir
 from config.logger import setup_logging
 from .mcp_client import ServerMCPClient
@@ -35,7 +35,11 @@ class ServerMCPManager:
                 f"请检查mcp服务配置文件：data/.mcp_server_settings.json"
             )
         self.clients: Dict[str, ServerMCPClient] = {}
+        # 每个客户端一把重连锁，并发调用同时失败时只重建一次客户端
+        self._reconnect_locks: Dict[str, asyncio.Lock] = {}
         self.tools = []
+        # 工具列表版本号，工具列表变化时递增，供执行器判断缓存是否失效
+        self.tools_version = 0
 
     def load_config(self) -> Dict[str, Any]:
         """加载MCP服务配置"""
@@ -53,33 +57,50 @@ class ServerMCPManager:
             return {}
 
     async def initialize_servers(self) -> None:
-        """初始化所有MCP服务"""
+        """初始化所有MCP服务（各服务并发启动）"""
         config = self.load_config()
+        names = []
+        init_tasks = []
         for name, srv_config in config.items():
             if not srv_config.get("command") and not srv_config.get("url"):
                 logger.bind(tag=TAG).warning(
                     f"Skipping server {name}: neither command nor url specified"
                 )
                 continue
+            names.append(name)
+            init_tasks.append(self._initialize_server(name, srv_config))
 
-            try:
-                # 初始化服务端MCP客户端，传入设备ID和API认证信息
-                logger.bind(tag=TAG).info(f"初始化服务端MCP客户端: {name}，设备ID: {self.device_id}")
-                client = ServerMCPClient(srv_config, self.device_id, self.secret_id, self.secret_key)
-                await client.initialize()
-                self.clients[name] = client
-                client_tools = client.get_available_tools()
-                self.tools.extend(client_tools)
-
-            except Exception as e:
-                logger.bind(tag=TAG).error(
-                    f"Failed to initialize MCP server {name}: {e}"
-                )
+        # 按配置顺序登记客户端和工具，保证工具列表顺序稳定
+        results = await asyncio.gather(*init_tasks)
+        for name, result in zip(names, results):
+            if result is None:
+                continue
+            client, client_tools = result
+            self.clients[name] = client
+            self.tools.extend(client_tools)
+            self.tools_version += 1
 
         # 输出当前支持的服务端MCP工具列表
         if hasattr(self.conn, "func_handler") and self.conn.func_handler:
             self.conn.func_handler.current_support_functions()
 
+    async def _initialize_server(
+        self, name: str, srv_config: Dict[str, Any]
+    ) -> Optional[Tuple[ServerMCPClient, List[Dict[str, Any]]]]:
+        """初始化单个MCP服务，失败时返回None"""
+        try:
+            # 初始化服务端MCP客户端，传入设备ID和API认证信息
+            logger.bind(tag=TAG).info(f"初始化服务端MCP客户端: {name}，设备ID: {self.device_id}")
+            client = ServerMCPClient(srv_config, self.device_id, self.secret_id, self.secret_key)
+            await client.initialize()
+            return client, client.get_available_tools()
+
+        except Exception as e:
+            logger.bind(tag=TAG).error(
+                f"Failed to initialize MCP server {name}: {e}"
+            )
+            return None
+
     def get_all_tools(self) -> List[Dict[str, Any]]:
         """获取所有服务的工具function定义"""
         return self.tools
@@ -130,33 +151,70 @@ class ServerMCPManager:
                 logger.bind(tag=TAG).info(
                     f"重试前尝试重新连接 MCP 客户端 {client_name}"
                 )
-                try:
-                    # 关闭旧的连接
-                    await target_client.cleanup()
-
-                    # 重新初始化客户端
-                    config = self.load_config()
-                    if client_name in config:
-                        # 重新创建客户端时也要传递设备ID和API认证信息
-                        client = ServerMCPClient(config[client_name], self.device_id, self.secret_id, self.secret_key)
-                        await client.initialize()
-                        self.clients[client_name] = client
-                        target_client = client
-                        logger.bind(tag=TAG).info(
-                            f"成功重新连接 MCP 客户端: {client_name}，设备ID: {self.device_id}"
-                        )
-                    else:
-                        logger.bind(tag=TAG).error(
-                            f"Cannot reconnect MCP client {client_name}: config not found"
-                        )
-                except Exception as reconnect_error:
-                    logger.bind(tag=TAG).error(
-                        f"Failed to reconnect MCP client {client_name}: {reconnect_error}"
-                    )
+                target_client = await self._reconnect(client_name, target_client)
 
                 # 等待一段时间再重试
                 await asyncio.sleep(retry_interval)
 
+    async def _reconnect(
+        self, client_name: str, failed_client: ServerMCPClient
+    ) -> ServerMCPClient:
+        """重建失败的客户端并返回当前可用的客户端
+
+        在客户端的重连锁内完成关闭与重建；若其他调用已完成重连，直接复用新客户端，
+        避免重复创建客户端导致旧客户端及其后台任务泄漏
+        """
+        lock = self._reconnect_locks.setdefault(client_name, asyncio.Lock())
+        async with lock:
+            current = self.clients.get(client_name)
+            if current is not None and current is not failed_client:
+                return current
+
+            client = None
+            try:
+                # 关闭旧的连接
+                await failed_client.cleanup()
+
+                # 重新初始化客户端
+                config = self.load_config()
+                if client_name in config:
+                    # 重新创建客户端时也要传递设备ID和API认证信息
+                    client = ServerMCPClient(config[client_name], self.device_id, self.secret_id, self.secret_key)
+                    await client.initialize()
+                    self.clients[client_name] = client
+                    logger.bind(tag=TAG).info(
+                        f"成功重新连接 MCP 客户端: {client_name}，设备ID: {self.device_id}"
+                    )
+                    return client
+                logger.bind(tag=TAG).error(
+                    f"Cannot reconnect MCP client {client_name}: config not found"
+                )
+            except Exception as reconnect_error:
+                logger.bind(tag=TAG).error(
+                    f"Failed to reconnect MCP client {client_name}: {reconnect_error}"
+                )
+                # 初始化失败的新客户端同样需要关闭，避免遗留后台任务
+                if client is not None:
+                    try:
+                        await client.cleanup()
+                    except Exception:
+                        pass
+            return failed_client
+
+    async def execute_tools(self, calls: List[Tuple[str, Dict[str, Any]]]) -> List[Any]:
+        """并发执行多个工具调用
+
+        Args:
+            calls: (工具名称, 参数) 列表
+
+        Returns:
+            List[Any]: 与calls顺序一致的结果，执行失败的位置为对应的异常对象
+        """
+        return await asyncio.gather(
+            *(self.execute_tool(tool_name, arguments) for tool_name, arguments in calls),
+            return_exceptions=True,
+        )
+
     async def cleanup_all(self) -> None:
         """关闭所有 MCP客户端"""
         for name, client in list(self.clients.items()):
@@ -4,38 +4,53 @@ FastMCP服务器
 npx -y @modelcontextprotocol/inspector uv run server.py
 """
 
+import copy
 import json
 import sys
+import time
 import signal
-import requests
 from typing import List, Optional
 from pydantic import Field
 
 # 引入MCP相关
 from mcp.server.fastmcp import FastMCP
-from mcp.server.fastmcp.exceptions import ToolError
-
-# 引入腾讯云SDK
-from tencentcloud.common import credential
-from tencentcloud.common.profile.client_profile import ClientProfile
-from tencentcloud.common.profile.http_profile import HttpProfile
-from tencentcloud.common.exception.tencent_cloud_sdk_exception import (
-    TencentCloudSDKException,
-)
-from tencentcloud.tke.v20180525 import tke_client, models as models_2018
-from tencentcloud.cls.v20201016 import cls_client, models as models_2020
-from tencentcloud.monitor.v20180724 import monitor_client
+
+# 引入腾讯云SDK模型
+from tencentcloud.tke.v20180525 import models as models_2018
+from tencentcloud.tke.v20220501 import models as models_2022
+from tencentcloud.cls.v20201016 import models as models_2020
 from tencentcloud.monitor.v20180724 import models as models_20180724
 
+# 客户端、并发限制、请求合并与缓存等与tencent_mcp_cut.py共用
+from _tencent_common import (
+    _call_cls,
+    _call_cls_raw,
+    _call_monitor,
+    _call_tke,
+    _dump,
+    _invoke_tke,
+    _tc_tool,
+)
+
 # 创建FastMCP服务器实例
 mcp = FastMCP("Tencent-Cloud-Mcp-Server")
 
+
+def _fill_request(req, fields: tuple, values: tuple):
+    """按预先确定的字段顺序为请求对象赋值，值为None的字段保持未设置"""
+    for field, value in zip(fields, values):
+        if value is not None:
+            setattr(req, field, value)
+    return req
+
+
 # ==========================================
 # 腾讯云TKE接口
 # ==========================================
 
 
 @mcp.tool(description="查询集群列表")
+@_tc_tool()
 async def describe_clusters(
     secret_id: str = Field(description="腾讯云SecretId"),
     secret_key: str = Field(description="腾讯云SecretKey"),
@@ -57,34 +72,15 @@ async def describe_clusters(
     Raises:
         ToolError: 工具执行失败时抛出的异常
     """
-    try:
-        cred = credential.Credential(secret_id, secret_key)
-
-        httpProfile = HttpProfile()
-        httpProfile.endpoint = "tke.tencentcloudapi.com"
-
-        clientProfile = ClientProfile()
-        clientProfile.httpProfile = httpProfile
+    req = models_2018.DescribeClustersRequest()
 
-        client = tke_client.TkeClient(cred, region, clientProfile)
-
-        req = models_2018.DescribeClustersRequest()
-        params = {}
-
-        req.from_json_string(json.dumps(params))
-
-        resp = client.DescribeClusters(req)
-        return resp.to_json_string()
-
-    except TencentCloudSDKException as e:
-        raise ToolError(f"腾讯云API调用失败: {str(e)}")
-    except Exception as e:
-        raise ToolError(f"执行时发生错误: {str(e)}")
+    return await _call_tke(region, secret_id, secret_key, "DescribeClusters", req)
 
 
 @mcp.tool(
     description="查询用户单个Region下的所有集群巡检结果概览信息",
 )
+@_tc_tool()
 async def describe_cluster_inspection_results_overview(
     secret_id: str = Field(description="腾讯云SecretId"),
     secret_key: str = Field(description="腾讯云SecretKey"),
@@ -105,34 +101,15 @@ async def describe_cluster_inspection_results_overview(
     Raises:
         ToolError: API调用失败或执行时发生错误
     """
-    try:
-        cred = credential.Credential(secret_id, secret_key)
-
-        httpProfile = HttpProfile()
-        httpProfile.endpoint = "tke.tencentcloudapi.com"
-
-        clientProfile = ClientProfile()
-        clientProfile.httpProfile = httpProfile
-
-        client = tke_client.TkeClient(cred, region, clientProfile)
-
-        req = models_2018.DescribeClusterInspectionResultsOverviewRequest()
+    req = models_2018.DescribeClusterInspectionResultsOverviewRequest()
 
-        params = {}
-
-        req.from_json_string(json.dumps(params))
-
-        resp = client.DescribeClusterInspectionResultsOverview(req)
-
-        return resp.to_json_string()
-
-    except TencentCloudSDKException as e:
-        raise ToolError(f"腾讯云API调用失败: {str(e)}")
-    except Exception as e:
-        raise ToolError(f"执行时发生错误: {str(e)}")
+    return await _call_tke(
+        region, secret_id, secret_key, "DescribeClusterInspectionResultsOverview", req
+    )
 
 
 @mcp.tool(description="查询指定集群的巡检结果信息")
+@_tc_tool()
 async def list_cluster_inspection_results(
     secret_id: str = Field(description="腾讯云SecretId"),
     secret_key: str = Field(description="腾讯云SecretKey"),
@@ -158,44 +135,26 @@ async def list_cluster_inspection_results(
     Raises:
         ToolError: 工具执行失败时抛出的异常
     """
-    try:
-        cred = credential.Credential(secret_id, secret_key)
-
-        httpProfile = HttpProfile()
-        httpProfile.endpoint = "tke.tencentcloudapi.com"
-
-        clientProfile = ClientProfile()
-        clientProfile.httpProfile = httpProfile
-
-        client = tke_client.TkeClient(cred, region, clientProfile)
-
-        req = models_2018.ListClusterInspectionResultsRequest()
-        params = {}
+    req = models_2018.ListClusterInspectionResultsRequest()
 
-        req.from_json_string(json.dumps(params))
+    resp = await _invoke_tke(
+        region, secret_id, secret_key, "ListClusterInspectionResults", req
+    )
 
-        resp = client.ListClusterInspectionResults(req)
-        
-        # 解析API响应并过滤指定集群
-        response_data = json.loads(resp.to_json_string())
-        
-        # 关键修改：根据cluster_ids过滤结果
-        if cluster_ids:
-            filtered_results = [
-                result for result in response_data["InspectionResults"] 
-                if result["ClusterId"] in cluster_ids
-            ]
-            response_data["InspectionResults"] = filtered_results
-        
-        return json.dumps(response_data, ensure_ascii=False)
-
-    except TencentCloudSDKException as e:
-        raise ToolError(f"腾讯云API调用失败: {str(e)}")
-    except Exception as e:
-        raise ToolError(f"执行时发生错误: {str(e)}")
+    # 在SDK响应对象的浅拷贝上过滤指定集群，只序列化保留的结果；
+    # 响应对象可能被合并的并发请求共享，不能原地修改
+    if cluster_ids and resp.InspectionResults:
+        wanted = frozenset(cluster_ids)
+        resp = copy.copy(resp)
+        resp.InspectionResults = [
+            result for result in resp.InspectionResults
+            if result.ClusterId in wanted
+        ]
+    return _dump(resp)
 
 
 @mcp.tool(description="查看集群状态列表")
+@_tc_tool()
 async def describe_cluster_status(
     secret_id: str = Field(description="腾讯云SecretId"),
     secret_key: str = Field(description="腾讯云SecretKey"),
@@ -217,32 +176,13 @@ async def describe_cluster_status(
     Raises:
         ToolError: 工具执行失败时抛出的异常
     """
-    try:
-        cred = credential.Credential(secret_id, secret_key)
-
-        httpProfile = HttpProfile()
-        httpProfile.endpoint = "tke.tencentcloudapi.com"
-
-        clientProfile = ClientProfile()
-        clientProfile.httpProfile = httpProfile
-
-        client = tke_client.TkeClient(cred, region, clientProfile)
+    req = models_2018.DescribeClusterStatusRequest()
 
-        req = models_2018.DescribeClusterStatusRequest()
-        params = {}
-
-        req.from_json_string(json.dumps(params))
-
-        resp = client.DescribeClusterStatus(req)
-        return resp.to_json_string()
-
-    except TencentCloudSDKException as e:
-        raise ToolError(f"腾讯云API调用失败: {str(e)}")
-    except Exception as e:
-        raise ToolError(f"执行时发生错误: {str(e)}")
+    return await _call_tke(region, secret_id, secret_key, "DescribeClusterStatus", req)
 
 
 @mcp.tool(description="获取集群资源使用量")
+@_tc_tool()
 async def describe_resource_usage(
     secret_id: str = Field(description="腾讯云SecretId"),
     secret_key: str = Field(description="腾讯云SecretKey"),
@@ -266,31 +206,14 @@ async def describe_resource_usage(
     Raises:
         ToolError: 工具执行失败时抛出的异常
     """
-    try:
-        cred = credential.Credential(secret_id, secret_key)
-
-        httpProfile = HttpProfile()
-        httpProfile.endpoint = "tke.tencentcloudapi.com"
+    req = models_2018.DescribeResourceUsageRequest()
+    req.ClusterId = cluster_id
 
-        clientProfile = ClientProfile()
-        clientProfile.httpProfile = httpProfile
-
-        client = tke_client.TkeClient(cred, region, clientProfile)
-
-        req = models_2018.DescribeResourceUsageRequest()
-        params = {"ClusterId": cluster_id}
-        req.from_json_string(json.dumps(params))
-
-        resp = client.DescribeResourceUsage(req)
-        return resp.to_json_string()
-
-    except TencentCloudSDKException as e:
-        raise ToolError(f"腾讯云API调用失败: {str(e)}")
-    except Exception as e:
-        raise ToolError(f"执行时发生错误: {str(e)}")
+    return await _call_tke(region, secret_id, secret_key, "DescribeResourceUsage", req)
 
 
 @mcp.tool(description="获取addon列表")
+@_tc_tool()
 async def describe_addon(
     secret_id: str = Field(description="腾讯云SecretId"),
     secret_key: str = Field(description="腾讯云SecretKey"),
@@ -318,35 +241,16 @@ async def describe_addon(
     Raises:
         ToolError: 工具执行失败时抛出的异常
     """
-    try:
-        cred = credential.Credential(secret_id, secret_key)
-
-        httpProfile = HttpProfile()
-        httpProfile.endpoint = "tke.tencentcloudapi.com"
-
-        clientProfile = ClientProfile()
-        clientProfile.httpProfile = httpProfile
-
-        client = tke_client.TkeClient(cred, region, clientProfile)
-
-        req = models_2018.DescribeAddonRequest()
-        params = {"ClusterId": cluster_id}
+    req = models_2018.DescribeAddonRequest()
+    req.ClusterId = cluster_id
+    if addon_name:
+        req.AddonName = addon_name
 
-        if addon_name:
-            params["AddonName"] = addon_name
-
-        req.from_json_string(json.dumps(params))
-
-        resp = client.DescribeAddon(req)
-        return resp.to_json_string()
-
-    except TencentCloudSDKException as e:
-        raise ToolError(f"腾讯云API调用失败: {str(e)}")
-    except Exception as e:
-        raise ToolError(f"执行时发生错误: {str(e)}")
+    return await _call_tke(region, secret_id, secret_key, "DescribeAddon", req)
 
 
 @mcp.tool(description="查询节点池列表")
+@_tc_tool()
 async def describe_cluster_node_pools(
     secret_id: str = Field(description="腾讯云SecretId"),
     secret_key: str = Field(description="腾讯云SecretKey"),
@@ -374,37 +278,19 @@ async def describe_cluster_node_pools(
     Raises:
         ToolError: 工具执行失败时抛出的异常
     """
-    try:
-        cred = credential.Credential(secret_id, secret_key)
-
-        httpProfile = HttpProfile()
-        httpProfile.endpoint = "tke.tencentcloudapi.com"
-
-        clientProfile = ClientProfile()
-        clientProfile.httpProfile = httpProfile
-
-        # 注意：这里需要使用正确版本的客户端
-        # 确保导入的是 v20220501 版本
-        from tencentcloud.tke.v20220501 import tke_client
-        from tencentcloud.tke.v20220501 import models as models_2022
-
-        client = tke_client.TkeClient(cred, region, clientProfile)
-
-        req = models_2022.DescribeNodePoolsRequest()
-        params = {"ClusterId": cluster_id, "Offset": offset, "Limit": limit}
+    # 注意：节点池接口需要使用 v20220501 版本的客户端和模型
+    req = models_2022.DescribeNodePoolsRequest()
+    req.ClusterId = cluster_id
+    req.Offset = offset
+    req.Limit = limit
 
-        req.from_json_string(json.dumps(params))
-
-        resp = client.DescribeNodePools(req)
-        return resp.to_json_string()
-
-    except TencentCloudSDKException as e:
-        raise ToolError(f"腾讯云API调用失败: {str(e)}")
-    except Exception as e:
-        raise ToolError(f"执行时发生错误: {str(e)}")
+    return await _call_tke(
+        region, secret_id, secret_key, "DescribeNodePools", req, version="2022"
+    )
 
 
 @mcp.tool(description="查询集群下节点实例信息")
+@_tc_tool()
 async def describe_cluster_instances(
     secret_id: str = Field(description="腾讯云SecretId"),
     secret_key: str = Field(description="腾讯云SecretKey"),
@@ -434,39 +320,22 @@ async def describe_cluster_instances(
     Raises:
         ToolError: 工具执行失败时抛出的异常
     """
-    try:
-        cred = credential.Credential(secret_id, secret_key)
-
-        httpProfile = HttpProfile()
-        httpProfile.endpoint = "tke.tencentcloudapi.com"
-
-        clientProfile = ClientProfile()
-        clientProfile.httpProfile = httpProfile
-
-        client = tke_client.TkeClient(cred, region, clientProfile)
-
-        req = models_2018.DescribeClusterInstancesRequest()
-        params = {"ClusterId": cluster_id}
-
-        if offset is not None:
-            params["Offset"] = offset
-        if limit is not None:
-            params["Limit"] = limit
-
-        req.from_json_string(json.dumps(params))
+    req = models_2018.DescribeClusterInstancesRequest()
+    req.ClusterId = cluster_id
+    if offset is not None:
+        req.Offset = offset
+    if limit is not None:
+        req.Limit = limit
 
-        resp = client.DescribeClusterInstances(req)
-        return resp.to_json_string()
-
-    except TencentCloudSDKException as e:
-        raise ToolError(f"腾讯云API调用失败: {str(e)}")
-    except Exception as e:
-        raise ToolError(f"执行时发生错误: {str(e)}")
+    return await _call_tke(
+        region, secret_id, secret_key, "DescribeClusterInstances", req
+    )
 
 
 @mcp.tool(
     description="查询集群在应用市场中已安装应用列表"
 )
+@_tc_tool()
 async def describe_cluster_releases(
     secret_id: str = Field(description="腾讯云SecretId"),
     secret_key: str = Field(description="腾讯云SecretKey"),
@@ -494,39 +363,22 @@ async def describe_cluster_releases(
     Raises:
         ToolError: 工具执行失败时抛出的异常
     """
-    try:
-        cred = credential.Credential(secret_id, secret_key)
-
-        httpProfile = HttpProfile()
-        httpProfile.endpoint = "tke.tencentcloudapi.com"
-
-        clientProfile = ClientProfile()
-        clientProfile.httpProfile = httpProfile
-
-        client = tke_client.TkeClient(cred, region, clientProfile)
-
-        req = models_2018.DescribeClusterReleasesRequest()
-        params = {"ClusterId": cluster_id}
-
-        if limit is not None:
-            params["Limit"] = limit
-        if offset is not None:
-            params["Offset"] = offset
-
-        req.from_json_string(json.dumps(params))
-
-        resp = client.DescribeClusterReleases(req)
-        return resp.to_json_string()
+    req = models_2018.DescribeClusterReleasesRequest()
+    req.ClusterId = cluster_id
+    if limit is not None:
+        req.Limit = limit
+    if offset is not None:
+        req.Offset = offset
 
-    except TencentCloudSDKException as e:
-        raise ToolError(f"腾讯云API调用失败: {str(e)}")
-    except Exception as e:
-        raise ToolError(f"执行时发生错误: {str(e)}")
+    return await _call_tke(
+        region, secret_id, secret_key, "DescribeClusterReleases", req
+    )
 
 
 @mcp.tool(
     description="查询集群在应用市场中某个已安装应用的版本历史",
 )
+@_tc_tool()
 async def describe_cluster_release_history(
     secret_id: str = Field(description="腾讯云SecretId"),
     secret_key: str = Field(description="腾讯云SecretKey"),
@@ -554,34 +406,20 @@ async def describe_cluster_release_history(
     Raises:
         ToolError: 工具执行失败时抛出的异常
     """
-    try:
-        cred = credential.Credential(secret_id, secret_key)
+    req = models_2018.DescribeClusterReleaseHistoryRequest()
+    req.ClusterId = cluster_id
+    req.Name = name
+    req.Namespace = namespace
 
-        httpProfile = HttpProfile()
-        httpProfile.endpoint = "tke.tencentcloudapi.com"
-
-        clientProfile = ClientProfile()
-        clientProfile.httpProfile = httpProfile
-
-        client = tke_client.TkeClient(cred, region, clientProfile)
-
-        req = models_2018.DescribeClusterReleaseHistoryRequest()
-        params = {"ClusterId": cluster_id, "Name": name, "Namespace": namespace}
-
-        req.from_json_string(json.dumps(params))
-
-        resp = client.DescribeClusterReleaseHistory(req)
-        return resp.to_json_string()
-
-    except TencentCloudSDKException as e:
-        raise ToolError(f"腾讯云API调用失败: {str(e)}")
-    except Exception as e:
-        raise ToolError(f"执行时发生错误: {str(e)}")
+    return await _call_tke(
+        region, secret_id, secret_key, "DescribeClusterReleaseHistory", req
+    )
 
 
 @mcp.tool(
     description="在应用市场中集群回滚应用至某个历史版本"
 )
+@_tc_tool()
 async def rollback_cluster_release(
     secret_id: str = Field(description="腾讯云SecretId"),
     secret_key: str = Field(description="腾讯云SecretKey"),
@@ -611,34 +449,13 @@ async def rollback_cluster_release(
     Raises:
         ToolError: 工具执行失败时抛出的异常
     """
-    try:
-        cred = credential.Credential(secret_id, secret_key)
-
-        httpProfile = HttpProfile()
-        httpProfile.endpoint = "tke.tencentcloudapi.com"
-
-        clientProfile = ClientProfile()
-        clientProfile.httpProfile = httpProfile
-
-        client = tke_client.TkeClient(cred, region, clientProfile)
+    req = models_2018.RollbackClusterReleaseRequest()
+    req.ClusterId = cluster_id
+    req.Name = name
+    req.Namespace = namespace
+    req.Revision = revision
 
-        req = models_2018.RollbackClusterReleaseRequest()
-        params = {
-            "ClusterId": cluster_id,
-            "Name": name,
-            "Namespace": namespace,
-            "Revision": revision,
-        }
-
-        req.from_json_string(json.dumps(params))
-
-        resp = client.RollbackClusterRelease(req)
-        return resp.to_json_string()
-
-    except TencentCloudSDKException as e:
-        raise ToolError(f"腾讯云API调用失败: {str(e)}")
-    except Exception as e:
-        raise ToolError(f"执行时发生错误: {str(e)}")
+    return await _call_tke(region, secret_id, secret_key, "RollbackClusterRelease", req)
 
 
 # ==========================================
@@ -647,6 +464,7 @@ async def rollback_cluster_release(
 
 
 @mcp.tool(description="查询腾讯云监控告警历史记录")
+@_tc_tool()
 async def describe_alarm_histories(
     secret_id: str = Field(description="腾讯云SecretId"),
     secret_key: str = Field(description="腾讯云SecretKey"),
@@ -680,41 +498,23 @@ async def describe_alarm_histories(
     Raises:
         ToolError: API调用失败时抛出的异常
     """
-    try:
-        cred = credential.Credential(secret_id, secret_key)
-
-        httpProfile = HttpProfile()
-        httpProfile.endpoint = "monitor.tencentcloudapi.com"
-
-        clientProfile = ClientProfile()
-        clientProfile.httpProfile = httpProfile
-
-        client = monitor_client.MonitorClient(cred, region, clientProfile)
-
-        req = models_20180724.DescribeAlarmHistoriesRequest()
-
-        params = {"Module": "monitor"}
+    req = models_20180724.DescribeAlarmHistoriesRequest()
 
-        if page_number is not None:
-            params["PageNumber"] = page_number
-        if page_size is not None:
-            params["PageSize"] = page_size
-        if order is not None:
-            params["Order"] = order
-        if start_time is not None:
-            params["StartTime"] = start_time
-        if end_time is not None:
-            params["EndTime"] = end_time
+    req.Module = "monitor"
+    if page_number is not None:
+        req.PageNumber = page_number
+    if page_size is not None:
+        req.PageSize = page_size
+    if order is not None:
+        req.Order = order
+    if start_time is not None:
+        req.StartTime = start_time
+    if end_time is not None:
+        req.EndTime = end_time
 
-        req.from_json_string(json.dumps(params))
-
-        resp = client.DescribeAlarmHistories(req)
-        return resp.to_json_string()
-
-    except TencentCloudSDKException as e:
-        raise ToolError(f"腾讯云API调用失败: {str(e)}")
-    except Exception as e:
-        raise ToolError(f"执行时发生错误: {str(e)}")
+    return await _call_monitor(
+        region, secret_id, secret_key, "DescribeAlarmHistories", req
+    )
 
 
 # ==========================================
@@ -723,6 +523,7 @@ async def describe_alarm_histories(
 
 
 @mcp.tool(description="获取告警历史，例如今天未恢复的告警")
+@_tc_tool()
 async def describe_alert_record_history(
     secret_id: str = Field(description="腾讯云SecretId"),
     secret_key: str = Field(description="腾讯云SecretKey"),
@@ -752,34 +553,21 @@ async def describe_alert_record_history(
     Raises:
         ToolError: 工具执行失败时抛出的异常
     """
-    try:
-        cred = credential.Credential(secret_id, secret_key)
-
-        httpProfile = HttpProfile()
-        httpProfile.endpoint = "cls.tencentcloudapi.com"
-
-        clientProfile = ClientProfile()
-        clientProfile.httpProfile = httpProfile
-
-        client = cls_client.ClsClient(cred, region, clientProfile)
-
-        req = models_2020.DescribeAlertRecordHistoryRequest()
-        params = {"From": from_time, "To": to_time, "Offset": offset, "Limit": limit}
-
-        req.from_json_string(json.dumps(params))
-
-        resp = client.DescribeAlertRecordHistory(req)
-        return resp.to_json_string()
+    req = models_2020.DescribeAlertRecordHistoryRequest()
+    req.From = from_time
+    req.To = to_time
+    req.Offset = offset
+    req.Limit = limit
 
-    except TencentCloudSDKException as e:
-        raise ToolError(f"腾讯云API调用失败: {str(e)}")
-    except Exception as e:
-        raise ToolError(f"执行时发生错误: {str(e)}")
+    return await _call_cls(
+        region, secret_id, secret_key, "DescribeAlertRecordHistory", req
+    )
 
 
 @mcp.tool(
     description="获取腾讯云日志服务的日志集信息列表"
 )
+@_tc_tool("日志集列表查询执行时发生错误")
 async def describe_logsets(
     secret_id: str = Field(description="腾讯云SecretId"),
     secret_key: str = Field(description="腾讯云SecretKey"),
@@ -807,34 +595,17 @@ async def describe_logsets(
     Raises:
         ToolError: API调用失败时抛出的异常
     """
-    try:
-        cred = credential.Credential(secret_id, secret_key)
+    req = models_2020.DescribeLogsetsRequest()
+    req.Offset = offset
+    req.Limit = limit
 
-        httpProfile = HttpProfile()
-        httpProfile.endpoint = "cls.tencentcloudapi.com"
-
-        clientProfile = ClientProfile()
-        clientProfile.httpProfile = httpProfile
-
-        client = cls_client.ClsClient(cred, region, clientProfile)
-
-        req = models_2020.DescribeLogsetsRequest()
-        params = {"Offset": offset, "Limit": limit}
-
-        req.from_json_string(json.dumps(params))
-
-        resp = client.DescribeLogsets(req)
-        return resp.to_json_string()
-
-    except TencentCloudSDKException as e:
-        raise ToolError(f"腾讯云API调用失败: {str(e)}")
-    except Exception as e:
-        raise ToolError(f"日志集列表查询执行时发生错误: {str(e)}")
+    return await _call_cls(region, secret_id, secret_key, "DescribeLogsets", req)
 
 
 @mcp.tool(
     description="获取腾讯云日志服务的日志主题列表，支持分页和多种过滤条件",
 )
+@_tc_tool("日志主题列表查询执行时发生错误")
 async def describe_topics(
     secret_id: str = Field(description="腾讯云SecretId"),
     secret_key: str = Field(description="腾讯云SecretKey"),
@@ -862,34 +633,34 @@ async def describe_topics(
     Raises:
         ToolError: API调用失败时抛出的异常
     """
-    try:
-        cred = credential.Credential(secret_id, secret_key)
-
-        httpProfile = HttpProfile()
-        httpProfile.endpoint = "cls.tencentcloudapi.com"
-
-        clientProfile = ClientProfile()
-        clientProfile.httpProfile = httpProfile
-
-        client = cls_client.ClsClient(cred, region, clientProfile)
-
-        req = models_2020.DescribeTopicsRequest()
-        params = {"Offset": offset, "Limit": limit}
-
-        req.from_json_string(json.dumps(params))
-
-        resp = client.DescribeTopics(req)
-        return resp.to_json_string()
-
-    except TencentCloudSDKException as e:
-        raise ToolError(f"腾讯云API调用失败: {str(e)}")
-    except Exception as e:
-        raise ToolError(f"日志主题列表查询执行时发生错误: {str(e)}")
+    req = models_2020.DescribeTopicsRequest()
+    req.Offset = offset
+    req.Limit = limit
+
+    return await _call_cls(region, secret_id, secret_key, "DescribeTopics", req)
+
+
+# SearchLogRequest字段，顺序与search_log中的取值一一对应
+_SEARCH_LOG_FIELDS = (
+    "From",
+    "To",
+    "Query",
+    "SyntaxRule",
+    "TopicId",
+    "Sort",
+    "Limit",
+    "Offset",
+    "Context",
+    "SamplingRate",
+    "UseNewAnalysis",
+    "HighLight",
+)
 
 
 @mcp.tool(
     description="检索分析日志数据，支持CQL和Lucene语法"
 )
+@_tc_tool("日志检索分析执行时发生错误")
 async def search_log(
     secret_id: str = Field(description="腾讯云SecretId"),
     secret_key: str = Field(description="腾讯云SecretKey"),
@@ -943,48 +714,47 @@ async def search_log(
     Raises:
         ToolError: API调用失败时抛出的异常
     """
-    try:
-        cred = credential.Credential(secret_id, secret_key)
-
-        httpProfile = HttpProfile()
-        httpProfile.endpoint = "cls.tencentcloudapi.com"
-
-        clientProfile = ClientProfile()
-        clientProfile.httpProfile = httpProfile
-
-        client = cls_client.ClsClient(cred, region, clientProfile)
-
-        req = models_2020.SearchLogRequest()
-        params = {
-            "From": from_time,
-            "To": to_time,
-            "Query": query,
-            "SyntaxRule": syntax_rule,
-            "Sort": sort,
-            "Limit": limit,
-            "Offset": offset,
-            "SamplingRate": sampling_rate,
-            "UseNewAnalysis": use_new_analysis,
-            "HighLight": highlight,
-        }
-
-        if topic_id is not None:
-            params["TopicId"] = topic_id
-        if context is not None:
-            params["Context"] = context
-
-        req.from_json_string(json.dumps(params))
-
-        resp = client.SearchLog(req)
-        return resp.to_json_string()
-
-    except TencentCloudSDKException as e:
-        raise ToolError(f"腾讯云API调用失败: {str(e)}")
-    except Exception as e:
-        raise ToolError(f"日志检索分析执行时发生错误: {str(e)}")
+    req = models_2020.SearchLogRequest()
+    # 日志内容较大，显式要求gzip压缩响应
+    req.headers = {"Accept-Encoding": "gzip"}
+    _fill_request(
+        req,
+        _SEARCH_LOG_FIELDS,
+        (
+            from_time,
+            to_time,
+            query,
+            syntax_rule,
+            topic_id,
+            sort,
+            limit,
+            offset,
+            context,
+            sampling_rate,
+            use_new_analysis,
+            highlight,
+        ),
+    )
+
+    return await _call_cls_raw(region, secret_id, secret_key, "SearchLog", req)
+
+
+# DescribeLogContextRequest字段，顺序与describe_log_context中的取值一一对应
+_LOG_CONTEXT_FIELDS = (
+    "TopicId",
+    "BTime",
+    "PkgId",
+    "PkgLogId",
+    "PrevLogs",
+    "NextLogs",
+    "Query",
+    "From",
+    "To",
+)
 
 
 @mcp.tool(description="搜索指定日志附近的上下文内容")
+@_tc_tool("日志上下文检索执行时发生错误")
 async def describe_log_context(
     secret_id: str = Field(description="腾讯云SecretId"),
     secret_key: str = Field(description="腾讯云SecretKey"),
@@ -1030,49 +800,42 @@ async def describe_log_context(
     Raises:
         ToolError: API调用失败时抛出的异常
     """
-    try:
-        cred = credential.Credential(secret_id, secret_key)
-
-        httpProfile = HttpProfile()
-        httpProfile.endpoint = "cls.tencentcloudapi.com"
-
-        clientProfile = ClientProfile()
-        clientProfile.httpProfile = httpProfile
-
-        client = cls_client.ClsClient(cred, region, clientProfile)
-
-        req = models_2020.DescribeLogContextRequest()
-        params = {
-            "TopicId": topic_id,
-            "BTime": b_time,
-            "PkgId": pkg_id,
-            "PkgLogId": pkg_log_id,
-            "PrevLogs": prev_logs,
-            "NextLogs": next_logs,
-        }
-
-        if query is not None:
-            params["Query"] = query
-        if from_time is not None:
-            params["From"] = from_time
-        if to_time is not None:
-            params["To"] = to_time
-
-        req.from_json_string(json.dumps(params))
-
-        resp = client.DescribeLogContext(req)
-        return resp.to_json_string()
-
-    except TencentCloudSDKException as e:
-        raise ToolError(f"腾讯云API调用失败: {str(e)}")
-    except Exception as e:
-        raise ToolError(f"日志上下文检索执行时发生错误: {str(e)}")
+    req = models_2020.DescribeLogContextRequest()
+    # 日志内容较大，显式要求gzip压缩响应
+    req.headers = {"Accept-Encoding": "gzip"}
+    _fill_request(
+        req,
+        _LOG_CONTEXT_FIELDS,
+        (
+            topic_id,
+            b_time,
+            pkg_id,
+            pkg_log_id,
+            prev_logs,
+            next_logs,
+            query,
+            from_time,
+            to_time,
+        ),
+    )
+
+    return await _call_cls_raw(region, secret_id, secret_key, "DescribeLogContext", req)
 
 # ==========================================
 # 时间戳工具
 # ==========================================
 
 
+# 时间戳响应中除时间戳外均为常量，预先序列化，调用时只拼接时间戳
+_TIMESTAMP_PREFIX = '{"timestamp": '
+_SECONDS_SUFFIX = ", " + json.dumps(
+    {"unit": "seconds", "description": "Unix时间戳（秒级）"}, ensure_ascii=False
+)[1:]
+_MILLISECONDS_SUFFIX = ", " + json.dumps(
+    {"unit": "milliseconds", "description": "Unix时间戳（毫秒级）"}, ensure_ascii=False
+)[1:]
+
+
 @mcp.tool(description="获取当前时间的Unix时间戳，精确到秒")
 async def get_unix_timestamp_seconds() -> str:
     """
@@ -1084,23 +847,9 @@ async def get_unix_timestamp_seconds() -> str:
     Returns:
         str: Unix时间戳（秒），如：1611650000
     """
-    import time
-
-    try:
-        # 获取当前时间的Unix时间戳（秒）
-        timestamp_seconds = int(time.time())
-
-        return json.dumps(
-            {
-                "timestamp": timestamp_seconds,
-                "unit": "seconds",
-                "description": "Unix时间戳（秒级）",
-            },
-            ensure_ascii=False,
-        )
-
-    except Exception as e:
-        raise ToolError(f"获取Unix时间戳（秒）时发生错误: {str(e)}")
+    # 获取当前时间的Unix时间戳（秒）
+    timestamp_seconds = int(time.time())
+    return f"{_TIMESTAMP_PREFIX}{timestamp_seconds}{_SECONDS_SUFFIX}"
 
 
 @mcp.tool(description="获取当前时间的Unix时间戳，精确到毫秒")
@@ -1114,23 +863,9 @@ async def get_unix_timestamp_milliseconds() -> str:
     Returns:
         str: Unix时间戳（毫秒），如：1619581700000
     """
-    import time
-
-    try:
-        # 获取当前时间的Unix时间戳（毫秒）
-        timestamp_milliseconds = int(time.time() * 1000)
-
-        return json.dumps(
-            {
-                "timestamp": timestamp_milliseconds,
-                "unit": "milliseconds",
-                "description": "Unix时间戳（毫秒级）",
-            },
-            ensure_ascii=False,
-        )
-
-    except Exception as e:
-        raise ToolError(f"获取Unix时间戳（毫秒）时发生错误: {str(e)}")
+    # 获取当前时间的Unix时间戳（毫秒）
+    timestamp_milliseconds = time.time_ns() // 1_000_000
+    return f"{_TIMESTAMP_PREFIX}{timestamp_milliseconds}{_MILLISECONDS_SUFFIX}"
 
 
 # ==========================================
@@ -1145,8 +880,6 @@ def signal_handler(signum, frame):
 
 def main():
     """主函数"""
-    global notification_enabled
-
     # 注册信号处理器
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
@@ -4,38 +4,33 @@ FastMCP服务器
 npx -y @modelcontextprotocol/inspector uv run server.py
 """
 
-import json
 import sys
 import signal
-import requests
-from typing import List, Optional
+from typing import Optional
 from pydantic import Field
 
 # 引入MCP相关
 from mcp.server.fastmcp import FastMCP
-from mcp.server.fastmcp.exceptions import ToolError
-
-# 引入腾讯云SDK
-from tencentcloud.common import credential
-from tencentcloud.common.profile.client_profile import ClientProfile
-from tencentcloud.common.profile.http_profile import HttpProfile
-from tencentcloud.common.exception.tencent_cloud_sdk_exception import (
-    TencentCloudSDKException,
-)
-from tencentcloud.tke.v20180525 import tke_client, models as models_2018
-from tencentcloud.cls.v20201016 import cls_client, models as models_2020
-from tencentcloud.monitor.v20180724 import monitor_client
-from tencentcloud.monitor.v20180724 import models as models_20180724
+
+# 引入腾讯云SDK模型
+from tencentcloud.tke.v20180525 import models as models_2018
+from tencentcloud.tke.v20220501 import models as models_2022
+from tencentcloud.cls.v20201016 import models as models_2020
+
+# 客户端、并发限制、请求合并与缓存等与tencent_mcp.py共用
+from _tencent_common import _call_cls, _call_tke, _tc_tool
 
 # 创建FastMCP服务器实例
 mcp = FastMCP("Tencent-Cloud-Mcp-Server")
 
+
 # ==========================================
 # 腾讯云TKE接口
 # ==========================================
 
 
 @mcp.tool(description="查询集群列表")
+@_tc_tool()
 async def describe_clusters(
     secret_id: str = Field(description="腾讯云SecretId"),
     secret_key: str = Field(description="腾讯云SecretKey"),
@@ -57,30 +52,13 @@ async def describe_clusters(
     Raises:
         ToolError: 工具执行失败时抛出的异常
     """
-    try:
-        cred = credential.Credential(secret_id, secret_key)
-
-        httpProfile = HttpProfile()
-        httpProfile.endpoint = "tke.tencentcloudapi.com"
+    req = models_2018.DescribeClustersRequest()
 
-        clientProfile = ClientProfile()
-        clientProfile.httpProfile = httpProfile
+    return await _call_tke(region, secret_id, secret_key, "DescribeClusters", req)
 
-        client = tke_client.TkeClient(cred, region, clientProfile)
 
-        req = models_2018.DescribeClustersRequest()
-        params = {}
-
-        req.from_json_string(json.dumps(params))
-
-        resp = client.DescribeClusters(req)
-        return resp.to_json_string()
-
-    except TencentCloudSDKException as e:
-        raise ToolError(f"腾讯云API调用失败: {str(e)}")
-    except Exception as e:
-        raise ToolError(f"执行时发生错误: {str(e)}")
 @mcp.tool(description="查看集群状态列表")
+@_tc_tool()
 async def describe_cluster_status(
     secret_id: str = Field(description="腾讯云SecretId"),
     secret_key: str = Field(description="腾讯云SecretKey"),
@@ -102,32 +80,13 @@ async def describe_cluster_status(
     Raises:
         ToolError: 工具执行失败时抛出的异常
     """
-    try:
-        cred = credential.Credential(secret_id, secret_key)
-
-        httpProfile = HttpProfile()
-        httpProfile.endpoint = "tke.tencentcloudapi.com"
+    req = models_2018.DescribeClusterStatusRequest()
 
-        clientProfile = ClientProfile()
-        clientProfile.httpProfile = httpProfile
-
-        client = tke_client.TkeClient(cred, region, clientProfile)
-
-        req = models_2018.DescribeClusterStatusRequest()
-        params = {}
-
-        req.from_json_string(json.dumps(params))
-
-        resp = client.DescribeClusterStatus(req)
-        return resp.to_json_string()
-
-    except TencentCloudSDKException as e:
-        raise ToolError(f"腾讯云API调用失败: {str(e)}")
-    except Exception as e:
-        raise ToolError(f"执行时发生错误: {str(e)}")
+    return await _call_tke(region, secret_id, secret_key, "DescribeClusterStatus", req)
 
 
 @mcp.tool(description="获取集群资源使用量")
+@_tc_tool()
 async def describe_resource_usage(
     secret_id: str = Field(description="腾讯云SecretId"),
     secret_key: str = Field(description="腾讯云SecretKey"),
@@ -151,31 +110,14 @@ async def describe_resource_usage(
     Raises:
         ToolError: 工具执行失败时抛出的异常
     """
-    try:
-        cred = credential.Credential(secret_id, secret_key)
-
-        httpProfile = HttpProfile()
-        httpProfile.endpoint = "tke.tencentcloudapi.com"
-
-        clientProfile = ClientProfile()
-        clientProfile.httpProfile = httpProfile
-
-        client = tke_client.TkeClient(cred, region, clientProfile)
+    req = models_2018.DescribeResourceUsageRequest()
+    req.ClusterId = cluster_id
 
-        req = models_2018.DescribeResourceUsageRequest()
-        params = {"ClusterId": cluster_id}
-        req.from_json_string(json.dumps(params))
-
-        resp = client.DescribeResourceUsage(req)
-        return resp.to_json_string()
-
-    except TencentCloudSDKException as e:
-        raise ToolError(f"腾讯云API调用失败: {str(e)}")
-    except Exception as e:
-        raise ToolError(f"执行时发生错误: {str(e)}")
+    return await _call_tke(region, secret_id, secret_key, "DescribeResourceUsage", req)
 
 
 @mcp.tool(description="获取addon列表")
+@_tc_tool()
 async def describe_addon(
     secret_id: str = Field(description="腾讯云SecretId"),
     secret_key: str = Field(description="腾讯云SecretKey"),
@@ -203,35 +145,16 @@ async def describe_addon(
     Raises:
         ToolError: 工具执行失败时抛出的异常
     """
-    try:
-        cred = credential.Credential(secret_id, secret_key)
-
-        httpProfile = HttpProfile()
-        httpProfile.endpoint = "tke.tencentcloudapi.com"
-
-        clientProfile = ClientProfile()
-        clientProfile.httpProfile = httpProfile
-
-        client = tke_client.TkeClient(cred, region, clientProfile)
-
-        req = models_2018.DescribeAddonRequest()
-        params = {"ClusterId": cluster_id}
-
-        if addon_name:
-            params["AddonName"] = addon_name
-
-        req.from_json_string(json.dumps(params))
+    req = models_2018.DescribeAddonRequest()
+    req.ClusterId = cluster_id
+    if addon_name:
+        req.AddonName = addon_name
 
-        resp = client.DescribeAddon(req)
-        return resp.to_json_string()
-
-    except TencentCloudSDKException as e:
-        raise ToolError(f"腾讯云API调用失败: {str(e)}")
-    except Exception as e:
-        raise ToolError(f"执行时发生错误: {str(e)}")
+    return await _call_tke(region, secret_id, secret_key, "DescribeAddon", req)
 
 
 @mcp.tool(description="查询节点池列表")
+@_tc_tool()
 async def describe_cluster_node_pools(
     secret_id: str = Field(description="腾讯云SecretId"),
     secret_key: str = Field(description="腾讯云SecretKey"),
@@ -259,37 +182,19 @@ async def describe_cluster_node_pools(
     Raises:
         ToolError: 工具执行失败时抛出的异常
     """
-    try:
-        cred = credential.Credential(secret_id, secret_key)
-
-        httpProfile = HttpProfile()
-        httpProfile.endpoint = "tke.tencentcloudapi.com"
-
-        clientProfile = ClientProfile()
-        clientProfile.httpProfile = httpProfile
-
-        # 注意：这里需要使用正确版本的客户端
-        # 确保导入的是 v20220501 版本
-        from tencentcloud.tke.v20220501 import tke_client
-        from tencentcloud.tke.v20220501 import models as models_2022
-
-        client = tke_client.TkeClient(cred, region, clientProfile)
-
-        req = models_2022.DescribeNodePoolsRequest()
-        params = {"ClusterId": cluster_id, "Offset": offset, "Limit": limit}
-
-        req.from_json_string(json.dumps(params))
-
-        resp = client.DescribeNodePools(req)
-        return resp.to_json_string()
+    # 注意：节点池接口需要使用 v20220501 版本的客户端和模型
+    req = models_2022.DescribeNodePoolsRequest()
+    req.ClusterId = cluster_id
+    req.Offset = offset
+    req.Limit = limit
 
-    except TencentCloudSDKException as e:
-        raise ToolError(f"腾讯云API调用失败: {str(e)}")
-    except Exception as e:
-        raise ToolError(f"执行时发生错误: {str(e)}")
+    return await _call_tke(
+        region, secret_id, secret_key, "DescribeNodePools", req, version="2022"
+    )
 
 
 @mcp.tool(description="查询集群下节点实例信息")
+@_tc_tool()
 async def describe_cluster_instances(
     secret_id: str = Field(description="腾讯云SecretId"),
     secret_key: str = Field(description="腾讯云SecretKey"),
@@ -319,39 +224,22 @@ async def describe_cluster_instances(
     Raises:
         ToolError: 工具执行失败时抛出的异常
     """
-    try:
-        cred = credential.Credential(secret_id, secret_key)
+    req = models_2018.DescribeClusterInstancesRequest()
+    req.ClusterId = cluster_id
+    if offset is not None:
+        req.Offset = offset
+    if limit is not None:
+        req.Limit = limit
 
-        httpProfile = HttpProfile()
-        httpProfile.endpoint = "tke.tencentcloudapi.com"
-
-        clientProfile = ClientProfile()
-        clientProfile.httpProfile = httpProfile
-
-        client = tke_client.TkeClient(cred, region, clientProfile)
-
-        req = models_2018.DescribeClusterInstancesRequest()
-        params = {"ClusterId": cluster_id}
-
-        if offset is not None:
-            params["Offset"] = offset
-        if limit is not None:
-            params["Limit"] = limit
-
-        req.from_json_string(json.dumps(params))
-
-        resp = client.DescribeClusterInstances(req)
-        return resp.to_json_string()
-
-    except TencentCloudSDKException as e:
-        raise ToolError(f"腾讯云API调用失败: {str(e)}")
-    except Exception as e:
-        raise ToolError(f"执行时发生错误: {str(e)}")
+    return await _call_tke(
+        region, secret_id, secret_key, "DescribeClusterInstances", req
+    )
 
 
 @mcp.tool(
     description="查询集群在应用市场中已安装应用列表"
 )
+@_tc_tool()
 async def describe_cluster_releases(
     secret_id: str = Field(description="腾讯云SecretId"),
     secret_key: str = Field(description="腾讯云SecretKey"),
@@ -379,39 +267,22 @@ async def describe_cluster_releases(
     Raises:
         ToolError: 工具执行失败时抛出的异常
     """
-    try:
-        cred = credential.Credential(secret_id, secret_key)
-
-        httpProfile = HttpProfile()
-        httpProfile.endpoint = "tke.tencentcloudapi.com"
+    req = models_2018.DescribeClusterReleasesRequest()
+    req.ClusterId = cluster_id
+    if limit is not None:
+        req.Limit = limit
+    if offset is not None:
+        req.Offset = offset
 
-        clientProfile = ClientProfile()
-        clientProfile.httpProfile = httpProfile
-
-        client = tke_client.TkeClient(cred, region, clientProfile)
-
-        req = models_2018.DescribeClusterReleasesRequest()
-        params = {"ClusterId": cluster_id}
-
-        if limit is not None:
-            params["Limit"] = limit
-        if offset is not None:
-            params["Offset"] = offset
-
-        req.from_json_string(json.dumps(params))
-
-        resp = client.DescribeClusterReleases(req)
-        return resp.to_json_string()
-
-    except TencentCloudSDKException as e:
-        raise ToolError(f"腾讯云API调用失败: {str(e)}")
-    except Exception as e:
-        raise ToolError(f"执行时发生错误: {str(e)}")
+    return await _call_tke(
+        region, secret_id, secret_key, "DescribeClusterReleases", req
+    )
 
 
 @mcp.tool(
     description="查询集群在应用市场中某个已安装应用的版本历史",
 )
+@_tc_tool()
 async def describe_cluster_release_history(
     secret_id: str = Field(description="腾讯云SecretId"),
     secret_key: str = Field(description="腾讯云SecretKey"),
@@ -439,34 +310,20 @@ async def describe_cluster_release_history(
     Raises:
         ToolError: 工具执行失败时抛出的异常
     """
-    try:
-        cred = credential.Credential(secret_id, secret_key)
-
-        httpProfile = HttpProfile()
-        httpProfile.endpoint = "tke.tencentcloudapi.com"
-
-        clientProfile = ClientProfile()
-        clientProfile.httpProfile = httpProfile
+    req = models_2018.DescribeClusterReleaseHistoryRequest()
+    req.ClusterId = cluster_id
+    req.Name = name
+    req.Namespace = namespace
 
-        client = tke_client.TkeClient(cred, region, clientProfile)
-
-        req = models_2018.DescribeClusterReleaseHistoryRequest()
-        params = {"ClusterId": cluster_id, "Name": name, "Namespace": namespace}
-
-        req.from_json_string(json.dumps(params))
-
-        resp = client.DescribeClusterReleaseHistory(req)
-        return resp.to_json_string()
-
-    except TencentCloudSDKException as e:
-        raise ToolError(f"腾讯云API调用失败: {str(e)}")
-    except Exception as e:
-        raise ToolError(f"执行时发生错误: {str(e)}")
+    return await _call_tke(
+        region, secret_id, secret_key, "DescribeClusterReleaseHistory", req
+    )
 
 
 @mcp.tool(
     description="在应用市场中集群回滚应用至某个历史版本"
 )
+@_tc_tool()
 async def rollback_cluster_release(
     secret_id: str = Field(description="腾讯云SecretId"),
     secret_key: str = Field(description="腾讯云SecretKey"),
@@ -496,34 +353,13 @@ async def rollback_cluster_release(
     Raises:
         ToolError: 工具执行失败时抛出的异常
     """
-    try:
-        cred = credential.Credential(secret_id, secret_key)
-
-        httpProfile = HttpProfile()
-        httpProfile.endpoint = "tke.tencentcloudapi.com"
-
-        clientProfile = ClientProfile()
-        clientProfile.httpProfile = httpProfile
-
-        client = tke_client.TkeClient(cred, region, clientProfile)
-
-        req = models_2018.RollbackClusterReleaseRequest()
-        params = {
-            "ClusterId": cluster_id,
-            "Name": name,
-            "Namespace": namespace,
-            "Revision": revision,
-        }
+    req = models_2018.RollbackClusterReleaseRequest()
+    req.ClusterId = cluster_id
+    req.Name = name
+    req.Namespace = namespace
+    req.Revision = revision
 
-        req.from_json_string(json.dumps(params))
-
-        resp = client.RollbackClusterRelease(req)
-        return resp.to_json_string()
-
-    except TencentCloudSDKException as e:
-        raise ToolError(f"腾讯云API调用失败: {str(e)}")
-    except Exception as e:
-        raise ToolError(f"执行时发生错误: {str(e)}")
+    return await _call_tke(region, secret_id, secret_key, "RollbackClusterRelease", req)
 
 
 # ==========================================
@@ -533,6 +369,7 @@ async def rollback_cluster_release(
 @mcp.tool(
     description="获取腾讯云日志服务的日志集信息列表"
 )
+@_tc_tool("日志集列表查询执行时发生错误")
 async def describe_logsets(
     secret_id: str = Field(description="腾讯云SecretId"),
     secret_key: str = Field(description="腾讯云SecretKey"),
@@ -560,29 +397,11 @@ async def describe_logsets(
     Raises:
         ToolError: API调用失败时抛出的异常
     """
-    try:
-        cred = credential.Credential(secret_id, secret_key)
-
-        httpProfile = HttpProfile()
-        httpProfile.endpoint = "cls.tencentcloudapi.com"
-
-        clientProfile = ClientProfile()
-        clientProfile.httpProfile = httpProfile
-
-        client = cls_client.ClsClient(cred, region, clientProfile)
-
-        req = models_2020.DescribeLogsetsRequest()
-        params = {"Offset": offset, "Limit": limit}
-
-        req.from_json_string(json.dumps(params))
-
-        resp = client.DescribeLogsets(req)
-        return resp.to_json_string()
+    req = models_2020.DescribeLogsetsRequest()
+    req.Offset = offset
+    req.Limit = limit
 
-    except TencentCloudSDKException as e:
-        raise ToolError(f"腾讯云API调用失败: {str(e)}")
-    except Exception as e:
-        raise ToolError(f"日志集列表查询执行时发生错误: {str(e)}")
+    return await _call_cls(region, secret_id, secret_key, "DescribeLogsets", req)
 
 
 
@@ -3,6 +3,8 @@
 FastMCP服务器
 """
 
+import ast
+import operator
 import threading
 import time
 import json
@@ -15,19 +17,100 @@ import os
 import logging
 from typing import Any, Dict, List, Optional
 from pathlib import Path
+from functools import lru_cache
 import datetime
 from mcp.server.fastmcp import FastMCP, Context
 
 # 创建FastMCP服务器实例
 mcp = FastMCP("test-mcp-server")
 
+# 计算器允许的语法节点：数字常量与四则、取模、乘方运算
+_SAFE_NODES = (
+    ast.Expression,
+    ast.BinOp,
+    ast.UnaryOp,
+    ast.Constant,
+    ast.Add,
+    ast.Sub,
+    ast.Mult,
+    ast.Div,
+    ast.FloorDiv,
+    ast.Mod,
+    ast.Pow,
+    ast.USub,
+    ast.UAdd,
+)
+
+# 整数运算结果允许的最大位数，防止 9**9**9**9 之类的表达式长时间占用CPU和内存
+_MAX_INT_BITS = 4096
+
+_BIN_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+
+_UNARY_OPS = {
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+}
+
+
+@lru_cache(maxsize=512)
+def _compile_expression(expression: str) -> ast.Expression:
+    """校验并解析数学表达式，相同表达式复用解析结果"""
+    tree = ast.parse(expression, mode="eval")
+    for node in ast.walk(tree):
+        if not isinstance(node, _SAFE_NODES):
+            raise ValueError(f"不支持的表达式: {type(node).__name__}")
+        if isinstance(node, ast.Constant) and (
+            isinstance(node.value, bool) or not isinstance(node.value, (int, float))
+        ):
+            raise ValueError(f"不支持的常量: {node.value!r}")
+    return tree
+
+
+def _check_int_size(left, right, op_type) -> None:
+    """在执行整数乘法、乘方前估算结果位数，超出上限时拒绝计算"""
+    if not (isinstance(left, int) and isinstance(right, int)):
+        return
+    if op_type is ast.Pow:
+        if right > 0 and abs(left) > 1 and right * abs(left).bit_length() > _MAX_INT_BITS:
+            raise ValueError("计算结果过大")
+    elif op_type is ast.Mult:
+        if abs(left).bit_length() + abs(right).bit_length() > _MAX_INT_BITS:
+            raise ValueError("计算结果过大")
+
+
+def _evaluate(node):
+    """按语法树逐节点计算，乘法与乘方在计算前做结果大小检查"""
+    if isinstance(node, ast.Expression):
+        return _evaluate(node.body)
+    if isinstance(node, ast.Constant):
+        return node.value
+    if isinstance(node, ast.UnaryOp):
+        return _UNARY_OPS[type(node.op)](_evaluate(node.operand))
+    left = _evaluate(node.left)
+    right = _evaluate(node.right)
+    op_type = type(node.op)
+    _check_int_size(left, right, op_type)
+    return _BIN_OPS[op_type](left, right)
+
+
+def _safe_eval(expression: str):
+    """计算数学表达式，只支持数字与四则、取模、乘方运算"""
+    return _evaluate(_compile_expression(expression))
+
 @mcp.tool(description="执行基本的数学计算")
 def calculate(expression: str) -> str:
     """执行基本的数学计算"""
     global current_device_id
     try:
-        # 注意：生产环境中不要使用eval，这里仅作演示
-        result = eval(expression)
+        result = _safe_eval(expression)
         
         
         return f"计算结果: {result}"
@@ -39,8 +122,7 @@ def calculate_expression(expression: str) -> str:
     """执行数学表达式计算"""
     global current_device_id
     try:
-        # 注意：生产环境中不要使用eval，这里仅作演示
-        result = eval(expression)
+        result = _safe_eval(expression)
         
         
         return f"表达式 {expression} 的计算结果: {result}"
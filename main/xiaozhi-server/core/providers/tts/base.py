@@ -31,6 +31,8 @@ class TTSProviderBase(ABC):
     def __init__(self, config, delete_audio_file):
         self.interface_type = InterfaceType.NON_STREAM
         self.conn = None
+        # 构造时使用的完整配置，广播时据此判断不同连接能否共用同一份合成音频
+        self.config = config
         self.tts_timeout = 10
         self.delete_audio_file = delete_audio_file
         self.audio_file_type = "wav"
@@ -77,7 +79,7 @@ class TTSProviderBase(ABC):
             f"tts-{datetime.now().date()}@{uuid.uuid4().hex}{extension}",
         )
 
-    def to_tts(self, text):
+    def to_tts(self, text, is_opus=True):
         text = MarkdownCleaner.clean_markdown(text)
         max_repeat_time = 5
         if self.delete_audio_file:
@@ -87,7 +89,7 @@ class TTSProviderBase(ABC):
                     audio_bytes = asyncio.run(self.text_to_speak(text, None))
                     if audio_bytes:
                         audio_datas, _ = audio_bytes_to_data(
-                            audio_bytes, file_type=self.audio_file_type, is_opus=True
+                            audio_bytes, file_type=self.audio_file_type, is_opus=is_opus
                         )
                         return audio_datas
                     else:
@@ -323,19 +325,19 @@ class TTSProviderBase(ABC):
         else:
             return None
 
-    def _process_audio_file(self, tts_file):
+    def _process_audio_file(self, tts_file, audio_format=None):
         """处理音频文件并转换为指定格式
 
         Args:
             tts_file: 音频文件路径
-            content_detail: 内容详情
+            audio_format: 目标音频格式，默认使用当前连接的格式
 
         Returns:
             tuple: (sentence_type, audio_datas, content_detail)
         """
         if tts_file.endswith(".p3"):
             audio_datas, _ = p3.decode_opus_from_file(tts_file)
-        elif self.conn.audio_format == "pcm":
+        elif (audio_format or self.conn.audio_format) == "pcm":
             audio_datas, _ = self.audio_to_pcm_data(tts_file)
         else:
             audio_datas, _ = self.audio_to_opus_data(tts_file)
@@ -349,6 +351,25 @@ class TTSProviderBase(ABC):
             os.remove(tts_file)
         return audio_datas
 
+    def synthesize_once(self, text, audio_format="opus"):
+        """合成一段完整文本并直接返回音频帧，不经过连接的播放队列
+
+        仅适用于非流式接口，供广播时多个设备复用同一份音频
+
+        Args:
+            text: 要合成的文本
+            audio_format: 目标音频格式（opus/pcm）
+
+        Returns:
+            list: 音频帧列表，合成失败返回None
+        """
+        if self.delete_audio_file:
+            return self.to_tts(text, is_opus=audio_format != "pcm")
+        tts_file = self.to_tts(text)
+        if not tts_file or not os.path.exists(tts_file):
+            return None
+        return self._process_audio_file(tts_file, audio_format)
+
     def _process_before_stop_play_files(self):
         for audio_datas, text in self.before_stop_play_files:
             self.tts_audio_queue.put((SentenceType.MIDDLE, audio_datas, text))
@@ -11,76 +11,220 @@
 
 import asyncio
 import json
+import re
+import threading
 import time
-from typing import Dict, List, Optional, Any
-from datetime import datetime
-from collections import defaultdict, deque
+from enum import Enum
+from types import MappingProxyType
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Set, Tuple, Union
 from config.logger import setup_logging
 
 TAG = __name__
 
+# 缺失字段时共用的只读空字典，避免每次 .get(key, {}) 新建对象
+_EMPTY = MappingProxyType({})
+
+# objId 中的集群ID片段，格式: ...#cls-xxxxx#...
+_CLS_RE = re.compile(r"#(cls-[^#]+)")
+
+
+class ProduceResult(Enum):
+    """告警入队结果"""
+
+    ACCEPTED = "accepted"  # 已加入队列
+    FULL = "full"  # 集群队列达到高水位，被拒绝
+    NO_CLUSTER = "no_cluster"  # 无法提取集群ID，非集群告警
+
+    def __bool__(self) -> bool:
+        return self is ProduceResult.ACCEPTED
+
+
+class _Ring:
+    """固定容量的环形缓冲区，写满后覆盖最旧的告警（与deque(maxlen=...)语义一致）"""
+
+    __slots__ = ("buf", "head", "count", "maxlen")
+
+    def __init__(self, maxlen: int):
+        self.buf: List[Any] = [None] * maxlen
+        self.head = 0
+        self.count = 0
+        self.maxlen = maxlen
+
+    def push(self, item: Any):
+        """在队尾写入，队列已满时丢弃最旧的元素"""
+        tail = (self.head + self.count) % self.maxlen
+        self.buf[tail] = item
+        if self.count == self.maxlen:
+            self.head = (self.head + 1) % self.maxlen
+        else:
+            self.count += 1
+
+    def pop(self) -> Any:
+        """从队头取出元素，调用前需确认队列非空"""
+        item = self.buf[self.head]
+        self.buf[self.head] = None
+        self.head = (self.head + 1) % self.maxlen
+        self.count -= 1
+        return item
+
+    def __len__(self) -> int:
+        return self.count
+
+
 class ClusterAlertQueue:
     """集群告警队列管理器"""
     
-    def __init__(self, max_queue_size: int = 1000):
+    def __init__(
+        self,
+        max_queue_size: int = 1000,
+        high_watermark: float = 0.9,
+        cluster_queue_sizes: Optional[Dict[str, int]] = None,
+    ):
         """初始化告警队列管理器
         
         Args:
             max_queue_size: 每个集群队列的最大大小
+            high_watermark: 队列深度达到最大大小的该比例后拒绝新告警（背压）
+            cluster_queue_sizes: 按集群ID单独指定的队列大小，未指定的集群使用max_queue_size
         """
         self.logger = setup_logging()
+        self._log = self.logger.bind(tag=TAG)
         self.max_queue_size = max_queue_size
+        self.high_watermark = high_watermark
+        self.cluster_queue_sizes = dict(cluster_queue_sizes or {})
+        
+        # 按集群ID存储原始告警数据队列，每个集群一个预分配的环形缓冲区
+        self.alert_queues: Dict[str, _Ring] = {}
         
-        # 按集群ID存储原始告警数据队列
-        self.alert_queues: Dict[str, deque] = defaultdict(lambda: deque(maxlen=max_queue_size))
+        # 保护队列与等待者登记，生产者和消费者可能位于不同线程
+        self._lock = threading.Lock()
+        
+        # 按集群ID登记等待新告警的消费者 (事件循环, 事件)，事件由消费者在自己的循环中创建
+        self._waiters: Dict[str, Set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]]] = {}
         
         # 统计信息
         self.stats = {
             'total_produced': 0,
             'total_consumed': 0,
-            'clusters_with_alerts': set(),
-            'start_time': time.time()
+            'dropped': 0,
+            'start_time': time.monotonic()
         }
         
-        self.logger.bind(tag=TAG).info(f"集群告警队列管理器初始化完成，最大队列大小: {max_queue_size}")
+        # 上次打印状态的时间，print_status据此限频
+        self._last_status_time = float('-inf')
+        
+        self._log.info(f"集群告警队列管理器初始化完成，最大队列大小: {max_queue_size}")
 
-    def produce_alert(self, webhook_data: Dict[str, Any]) -> bool:
+    def produce_alert(self, webhook_data: Dict[str, Any]) -> ProduceResult:
         """生产告警（直接存储原始webhook数据到队列）
         
         Args:
             webhook_data: webhook原始数据
             
         Returns:
-            bool: 是否成功加入队列
+            ProduceResult: 入队结果，仅 ACCEPTED 为真值；入队判定与高水位检查在同一把锁内完成
         """
-        try:
-            # 从原始数据中提取集群ID
-            cluster_id = self._extract_cluster_id(webhook_data)
-            if not cluster_id:
-                self.logger.bind(tag=TAG).warning("无法从webhook数据中提取集群ID")
-                return False
-            
-            # 直接将原始数据加入对应集群的队列
-            self.alert_queues[cluster_id].append(webhook_data)
-            
-            # 更新统计
-            self.stats['total_produced'] += 1
-            self.stats['clusters_with_alerts'].add(cluster_id)
-            
-            # 提取基本信息用于日志
-            alert_id = webhook_data.get('request_body', {}).get('alertId', 'unknown')
-            policy_name = webhook_data.get('request_body', {}).get('alarmPolicyInfo', {}).get('policyName', 'unknown')
-            
-            self.logger.bind(tag=TAG).info(
-                f"原始告警已加入队列 - 集群: {cluster_id}, 告警ID: {alert_id}, 策略: {policy_name}"
+        # 从原始数据中提取集群ID（提取失败时返回None，内部已处理异常）
+        cluster_id = self._extract_cluster_id(webhook_data)
+        if not cluster_id:
+            self._log.warning("无法从webhook数据中提取集群ID")
+            return ProduceResult.NO_CLUSTER
+        
+        with self._lock:
+            # 队列达到高水位时拒绝入队，由上游决定限流或重试，而不是静默覆盖最旧的告警
+            ring = self._get_or_create_ring(cluster_id)
+            accepted = len(ring) < self._ring_limit(ring)
+            if accepted:
+                # 直接将原始数据加入对应集群的队列
+                ring.push(webhook_data)
+                self.stats['total_produced'] += 1
+            else:
+                self.stats['dropped'] += 1
+            queue_size = len(ring)
+            waiters = tuple(self._waiters.get(cluster_id, ()))
+        
+        if not accepted:
+            self._log.warning(
+                f"集群 {cluster_id} 告警队列已达高水位 ({queue_size}/{ring.maxlen})，拒绝新告警"
             )
+            return ProduceResult.FULL
+        
+        # 唤醒等待该集群的消费者
+        if waiters:
+            self._notify_waiters(waiters)
+        
+        # 提取基本信息用于日志
+        request_body = webhook_data.get('request_body') or _EMPTY
+        alert_id = request_body.get('alertId', 'unknown')
+        policy_name = (request_body.get('alarmPolicyInfo') or _EMPTY).get('policyName', 'unknown')
+        
+        self._log.info(
+            f"原始告警已加入队列 - 集群: {cluster_id}, 告警ID: {alert_id}, 策略: {policy_name}"
+        )
+        return ProduceResult.ACCEPTED
+
+    def _get_or_create_ring(self, cluster_id: str) -> _Ring:
+        """获取集群对应的告警队列，首次出现的集群创建新队列"""
+        ring = self.alert_queues.get(cluster_id)
+        if ring is None:
+            maxlen = self.cluster_queue_sizes.get(cluster_id, self.max_queue_size)
+            ring = self.alert_queues[cluster_id] = _Ring(maxlen)
+        return ring
+
+    @staticmethod
+    def _notify_waiters(waiters: Tuple[Tuple[asyncio.AbstractEventLoop, asyncio.Event], ...]):
+        """唤醒等待者，生产者不在消费者的事件循环中时通过call_soon_threadsafe投递"""
+        try:
+            current_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            current_loop = None
+        for loop, event in waiters:
+            if loop is current_loop:
+                event.set()
+            elif not loop.is_closed():
+                loop.call_soon_threadsafe(event.set)
+
+    async def wait_for(
+        self, cluster_ids: Union[str, Iterable[str]], timeout: Optional[float] = None
+    ) -> bool:
+        """等待指定集群有新告警，替代定时轮询
+        
+        Args:
+            cluster_ids: 单个集群ID或集群ID列表
+            timeout: 最长等待秒数，None表示一直等待
             
-            print(f"📥 原始告警已入队: {cluster_id} | {alert_id} | {policy_name}", flush=True)
+        Returns:
+            bool: 有告警可消费返回True，超时返回False
+        """
+        if isinstance(cluster_ids, str):
+            cluster_ids = (cluster_ids,)
+        else:
+            cluster_ids = tuple(cluster_ids)
+        
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self._lock:
+            # 检查与登记在同一把锁内完成，避免漏掉两者之间入队的告警
+            if any(self.alert_queues.get(cluster_id) for cluster_id in cluster_ids):
+                return True
+            for cluster_id in cluster_ids:
+                self._waiters.setdefault(cluster_id, set()).add(waiter)
+        try:
+            await asyncio.wait_for(waiter[1].wait(), timeout)
             return True
-            
-        except Exception as e:
-            self.logger.bind(tag=TAG).error(f"生产告警时发生错误: {e}")
+        except asyncio.TimeoutError:
             return False
+        finally:
+            with self._lock:
+                for cluster_id in cluster_ids:
+                    waiters = self._waiters.get(cluster_id)
+                    if waiters is not None:
+                        waiters.discard(waiter)
+                        if not waiters:
+                            del self._waiters[cluster_id]
+
+    def _ring_limit(self, ring: _Ring) -> int:
+        """队列允许的最大深度（高水位），至少为1"""
+        return max(1, int(ring.maxlen * self.high_watermark))
 
     def _extract_cluster_id(self, webhook_data: Dict[str, Any]) -> Optional[str]:
         """从webhook数据中提取集群ID
@@ -92,24 +236,19 @@ class ClusterAlertQueue:
             Optional[str]: 集群ID，如果提取失败则返回None
         """
         try:
-            request_body = webhook_data.get('request_body', {})
-            dimensions = request_body.get('alarmObjInfo', {}).get('dimensions', {})
+            request_body = webhook_data.get('request_body') or _EMPTY
+            dimensions = (request_body.get('alarmObjInfo') or _EMPTY).get('dimensions') or _EMPTY
             obj_id = dimensions.get('objId', '')
             
             # 从objId中提取集群ID (格式: ...#cls-xxxxx#...)
-            if '#cls-' in obj_id:
-                parts = obj_id.split('#')
-                for part in parts:
-                    if part.startswith('cls-'):
-                        return part
-            
-            return None
+            match = _CLS_RE.search(obj_id)
+            return match.group(1) if match else None
         except Exception as e:
-            self.logger.bind(tag=TAG).error(f"提取集群ID时发生错误: {e}")
+            self._log.error(f"提取集群ID时发生错误: {e}")
             return None
 
-    async def consume_alerts(self, cluster_id: str) -> Optional[Dict[str, Any]]:
-        """消费指定集群的告警
+    def pop_nowait(self, cluster_id: str) -> Optional[Dict[str, Any]]:
+        """同步取出指定集群的一条告警，供轮询消费者在自己的循环中直接调用
         
         Args:
             cluster_id: 集群ID
@@ -118,69 +257,85 @@ class ClusterAlertQueue:
             Optional[Dict[str, Any]]: 原始告警数据，如果队列为空则返回None
         """
         try:
-            if cluster_id in self.alert_queues and self.alert_queues[cluster_id]:
-                raw_alert = self.alert_queues[cluster_id].popleft()
+            with self._lock:
+                ring = self.alert_queues.get(cluster_id)
+                if not ring:
+                    return None
+                raw_alert = ring.pop()
                 self.stats['total_consumed'] += 1
-                
-                # 提取告警ID用于日志
-                alert_id = raw_alert.get('request_body', {}).get('alertId', 'unknown')
-                
-                self.logger.bind(tag=TAG).info(
-                    f"原始告警已消费 - 集群: {cluster_id}, 告警ID: {alert_id}"
-                )
-                
-                return raw_alert
-            return None
+            
+            # 提取告警ID用于日志
+            alert_id = (raw_alert.get('request_body') or _EMPTY).get('alertId', 'unknown')
+            
+            self._log.info(
+                f"原始告警已消费 - 集群: {cluster_id}, 告警ID: {alert_id}"
+            )
+            
+            return raw_alert
             
         except Exception as e:
-            self.logger.bind(tag=TAG).error(f"消费集群 {cluster_id} 告警时发生错误: {e}")
+            self._log.error(f"消费集群 {cluster_id} 告警时发生错误: {e}")
             return None
 
+    async def consume_alerts(self, cluster_id: str) -> Optional[Dict[str, Any]]:
+        """消费指定集群的告警（pop_nowait 的异步兼容接口）
+        
+        Args:
+            cluster_id: 集群ID
+            
+        Returns:
+            Optional[Dict[str, Any]]: 原始告警数据，如果队列为空则返回None
+        """
+        return self.pop_nowait(cluster_id)
+
     def get_queue_status(self) -> Dict[str, Any]:
         """获取队列状态信息"""
         cluster_status = {}
         total_alerts = 0
         
-        for cluster_id, queue in self.alert_queues.items():
-            queue_size = len(queue)
+        for cluster_id, queue_size, max_size in self.iter_queue_sizes():
             cluster_status[cluster_id] = {
                 'queue_size': queue_size,
-                'max_size': queue.maxlen
+                'max_size': max_size,
+                'queue_depth_pct': queue_size * 100.0 / max_size
             }
             total_alerts += queue_size
         
-        runtime = time.time() - self.stats['start_time']
+        runtime = time.monotonic() - self.stats['start_time']
         
         return {
             'total_alerts_in_queues': total_alerts,
-            'cluster_count': len(self.alert_queues),
+            'cluster_count': len(cluster_status),
             'cluster_status': cluster_status,
             'stats': {
                 'total_produced': self.stats['total_produced'],
                 'total_consumed': self.stats['total_consumed'],
-                'clusters_with_alerts': len(self.stats['clusters_with_alerts']),
+                'dropped': self.stats['dropped'],
+                'clusters_with_alerts': len(cluster_status),
                 'runtime_seconds': runtime
             }
         }
 
-    def print_status(self):
-        """打印队列状态"""
-        status = self.get_queue_status()
-        
-        print(f"\n📊 告警队列状态报告", flush=True)
-        print(f"=" * 50, flush=True)
-        print(f"队列中总告警数: {status['total_alerts_in_queues']}", flush=True)
-        print(f"涉及集群数: {status['cluster_count']}", flush=True)
-        print(f"已生产告警: {status['stats']['total_produced']}", flush=True)
-        print(f"已消费告警: {status['stats']['total_consumed']}", flush=True)
-        print(f"运行时间: {status['stats']['runtime_seconds']:.1f}秒", flush=True)
-        
-        if status['cluster_status']:
-            print(f"\n📋 各集群队列状态:", flush=True)
-            for cluster_id, cluster_info in status['cluster_status'].items():
-                queue_size = cluster_info['queue_size']
-                max_size = cluster_info['max_size']
-                print(f"  {cluster_id}: {queue_size}/{max_size} 告警", flush=True)
+    def get_metrics(self) -> Dict[str, Any]:
+        """获取背压相关指标
+
+        Returns:
+            Dict[str, Any]: dropped 为高水位拒绝的告警数，queue_depth_pct 为各集群队列深度百分比
+        """
+        return {
+            'dropped': self.stats['dropped'],
+            'queue_depth_pct': {
+                cluster_id: queue_size * 100.0 / max_size
+                for cluster_id, queue_size, max_size in self.iter_queue_sizes()
+            }
+        }
+
+    def iter_queue_sizes(self) -> Iterator[Tuple[str, int, int]]:
+        """逐个返回各集群的 (集群ID, 队列大小, 最大大小)，不构造中间字典，适合监控场景"""
+        with self._lock:
+            items = tuple(self.alert_queues.items())
+        for cluster_id, ring in items:
+            yield cluster_id, len(ring), ring.maxlen
 
     def get_queue_size(self, cluster_id: str) -> int:
         """获取指定集群的队列大小
@@ -202,31 +357,38 @@ class ClusterAlertQueue:
         return list(self.alert_queues.keys())
 
     def print_status(self):
-        """打印队列状态信息"""
-        if not hasattr(self, '_last_status_time'):
-            self._last_status_time = 0
-            
-        current_time = time.time()
-        if current_time - self._last_status_time < 30:  # 最多30秒打印一次
+        """打印队列状态信息（最多30秒打印一次）"""
+        current_time = time.monotonic()
+        if current_time - self._last_status_time < 30:
             return
             
         self._last_status_time = current_time
-        
-        total_alerts = sum(len(q) for q in self.alert_queues.values())
-        runtime = current_time - self.stats['start_time']
+        status = self.get_queue_status()
         
         print(f"\n📊 告警队列状态报告", flush=True)
         print(f"{'='*50}", flush=True)
-        print(f"队列中总告警数: {total_alerts}", flush=True)
-        print(f"涉及集群数: {len(self.alert_queues)}", flush=True)
-        print(f"已生产告警: {self.stats['total_produced']}", flush=True)
-        print(f"已消费告警: {self.stats['total_consumed']}", flush=True)
-        print(f"运行时间: {runtime:.1f}秒", flush=True)
+        print(f"队列中总告警数: {status['total_alerts_in_queues']}", flush=True)
+        print(f"涉及集群数: {status['cluster_count']}", flush=True)
+        print(f"已生产告警: {status['stats']['total_produced']}", flush=True)
+        print(f"已消费告警: {status['stats']['total_consumed']}", flush=True)
+        print(f"高水位拒绝告警: {status['stats']['dropped']}", flush=True)
+        print(f"运行时间: {status['stats']['runtime_seconds']:.1f}秒", flush=True)
         
-        if self.alert_queues:
+        if status['cluster_status']:
             print(f"\n📋 各集群队列状态:", flush=True)
-            for cluster_id, queue in self.alert_queues.items():
-                print(f"  {cluster_id}: {len(queue)}/{self.max_queue_size} 告警", flush=True)
+            for cluster_id, cluster_info in status['cluster_status'].items():
+                print(f"  {cluster_id}: {cluster_info['queue_size']}/{cluster_info['max_size']} 告警", flush=True)
+
+# 全局告警队列管理器实例，首次使用时创建
+_alert_queue_manager: Optional[ClusterAlertQueue] = None
+_alert_queue_manager_lock = threading.Lock()
+
 
-# 全局告警队列管理器实例
-alert_queue_manager = ClusterAlertQueue()
+def get_alert_queue_manager() -> ClusterAlertQueue:
+    """获取全局告警队列管理器实例"""
+    global _alert_queue_manager
+    if _alert_queue_manager is None:
+        with _alert_queue_manager_lock:
+            if _alert_queue_manager is None:
+                _alert_queue_manager = ClusterAlertQueue()
+    return _alert_queue_manager
@@ -6,13 +6,17 @@
 
 import asyncio
 import os
-import glob
 import time
-from datetime import datetime
 from config.logger import setup_logging
 
 TAG = __name__
 
+# 定期清理的camera_图片扩展名
+_CAMERA_IMAGE_EXTS = (".jpg", ".png", ".jpeg", ".bmp", ".gif")
+
+# 每批并发删除的文件数，避免一次性占满线程池
+_DELETE_BATCH_SIZE = 64
+
 
 class FileCleanupService:
     """文件清理服务"""
@@ -20,6 +24,7 @@ class FileCleanupService:
     def __init__(self, config: dict):
         self.config = config
         self.logger = setup_logging()
+        self._log = self.logger.bind(tag=TAG)
         self.uploads_dir = os.path.join(os.getcwd(), "uploads")
         self.cleanup_interval = 300  # 5分钟 = 300秒
         self.is_running = False
@@ -28,11 +33,11 @@ class FileCleanupService:
     async def start(self):
         """启动文件清理服务"""
         if self.is_running:
-            self.logger.bind(tag=TAG).warning("文件清理服务已经在运行中")
+            self._log.warning("文件清理服务已经在运行中")
             return
 
         self.is_running = True
-        self.logger.bind(tag=TAG).info(f"启动文件清理服务 - 清理间隔: {self.cleanup_interval}秒")
+        self._log.info(f"启动文件清理服务 - 清理间隔: {self.cleanup_interval}秒")
         print(f"[文件清理] 启动文件清理服务 - 每{self.cleanup_interval//60}分钟清理一次camera_开头的图片", flush=True)
 
         # 启动定期清理任务
@@ -51,7 +56,7 @@ class FileCleanupService:
             except asyncio.CancelledError:
                 pass
 
-        self.logger.bind(tag=TAG).info("文件清理服务已停止")
+        self._log.info("文件清理服务已停止")
         print("[文件清理] 文件清理服务已停止", flush=True)
 
     async def _cleanup_loop(self):
@@ -62,99 +67,124 @@ class FileCleanupService:
                 # 等待指定的时间间隔
                 await asyncio.sleep(self.cleanup_interval)
         except asyncio.CancelledError:
-            self.logger.bind(tag=TAG).info("文件清理循环被取消")
+            self._log.info("文件清理循环被取消")
         except Exception as e:
-            self.logger.bind(tag=TAG).error(f"文件清理循环发生错误: {e}")
+            self._log.error(f"文件清理循环发生错误: {e}")
             print(f"[文件清理] 错误: {e}", flush=True)
 
     async def _perform_cleanup(self):
         """执行文件清理"""
         try:
-            # 确保uploads目录存在
-            if not os.path.exists(self.uploads_dir):
-                self.logger.bind(tag=TAG).warning(f"uploads目录不存在: {self.uploads_dir}")
+            # 在线程中单次遍历目录，避免阻塞事件循环；目录不存在时由scandir抛出
+            try:
+                scanned_camera_files = (await asyncio.to_thread(self._scan_uploads))[0]
+            except FileNotFoundError:
+                self._log.warning(f"uploads目录不存在: {self.uploads_dir}")
                 return
 
-            # 查找所有camera_开头的图片文件
-            camera_pattern = os.path.join(self.uploads_dir, "camera_*.jpg")
-            camera_files = glob.glob(camera_pattern)
-
-            # 同时检查其他可能的图片格式
-            for ext in ['*.png', '*.jpeg', '*.bmp', '*.gif']:
-                pattern = os.path.join(self.uploads_dir, f"camera_{ext}")
-                camera_files.extend(glob.glob(pattern))
+            # 筛选camera_开头的图片文件
+            camera_files = [
+                (path, size)
+                for path, size in scanned_camera_files
+                if path.endswith(_CAMERA_IMAGE_EXTS)
+            ]
 
             if not camera_files:
-                self.logger.bind(tag=TAG).debug("没有找到需要清理的camera_开头的文件")
+                self._log.debug("没有找到需要清理的camera_开头的文件")
                 return
 
             # 删除找到的文件
             deleted_count = 0
             deleted_size = 0
             
-            for file_path in camera_files:
-                try:
-                    # 获取文件大小（用于统计）
-                    file_size = os.path.getsize(file_path)
-                    
-                    # 删除文件
-                    os.remove(file_path)
-                    deleted_count += 1
-                    deleted_size += file_size
-                    
-                    self.logger.bind(tag=TAG).debug(f"已删除文件: {os.path.basename(file_path)}")
-                    
-                except OSError as e:
-                    self.logger.bind(tag=TAG).error(f"删除文件失败 {file_path}: {e}")
+            # 分批在线程池中并发删除，避免阻塞事件循环（大小已在扫描时获取）
+            for start in range(0, len(camera_files), _DELETE_BATCH_SIZE):
+                batch = camera_files[start:start + _DELETE_BATCH_SIZE]
+                results = await asyncio.gather(
+                    *(asyncio.to_thread(os.remove, file_path) for file_path, _ in batch),
+                    return_exceptions=True,
+                )
+                for (file_path, file_size), result in zip(batch, results):
+                    if isinstance(result, OSError):
+                        self._log.error(f"删除文件失败 {file_path}: {result}")
+                    elif isinstance(result, BaseException):
+                        raise result
+                    else:
+                        deleted_count += 1
+                        deleted_size += file_size
+                        self._log.debug(f"已删除文件: {os.path.basename(file_path)}")
 
             if deleted_count > 0:
                 size_mb = deleted_size / (1024 * 1024)
-                self.logger.bind(tag=TAG).info(
+                self._log.info(
                     f"文件清理完成 - 删除了 {deleted_count} 个camera_开头的文件，释放空间: {size_mb:.2f} MB"
                 )
                 print(
-                    f"[文件清理] {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} - "
+                    f"[文件清理] {time.strftime('%Y-%m-%d %H:%M:%S')} - "
                     f"删除了 {deleted_count} 个camera_开头的文件，释放空间: {size_mb:.2f} MB", 
                     flush=True
                 )
             else:
-                self.logger.bind(tag=TAG).debug("本次清理没有删除任何文件")
+                self._log.debug("本次清理没有删除任何文件")
 
         except Exception as e:
-            self.logger.bind(tag=TAG).error(f"执行文件清理时发生错误: {e}")
+            self._log.error(f"执行文件清理时发生错误: {e}")
             print(f"[文件清理] 执行清理时发生错误: {e}", flush=True)
 
+    def _scan_uploads(self):
+        """单次遍历uploads目录
+
+        Returns:
+            tuple: (camera_文件, face_文件, 全部文件)，每项为 [(路径, 字节数)] 列表
+        """
+        camera_files, face_files, all_files = [], [], []
+        with os.scandir(self.uploads_dir) as it:
+            for entry in it:
+                name = entry.name
+                # 与glob("*")一致，跳过隐藏文件
+                if name.startswith(".") or not entry.is_file(follow_symlinks=False):
+                    continue
+                try:
+                    item = (entry.path, entry.stat(follow_symlinks=False).st_size)
+                except OSError:
+                    # 扫描期间文件已被删除
+                    continue
+                all_files.append(item)
+                if name.startswith("camera_"):
+                    camera_files.append(item)
+                elif name.startswith("face_"):
+                    face_files.append(item)
+        return camera_files, face_files, all_files
+
     async def manual_cleanup(self):
         """手动执行一次清理"""
-        self.logger.bind(tag=TAG).info("执行手动文件清理")
+        self._log.info("执行手动文件清理")
         print("[文件清理] 执行手动清理...", flush=True)
         await self._perform_cleanup()
 
     def get_cleanup_stats(self):
         """获取清理统计信息"""
         try:
-            if not os.path.exists(self.uploads_dir):
+            # 直接扫描，目录不存在时由scandir抛出，省去单独的exists检查
+            try:
+                camera_files, face_files, all_files = self._scan_uploads()
+            except FileNotFoundError:
                 return {
                     "uploads_dir_exists": False,
                     "error": "uploads目录不存在"
                 }
 
             # 统计camera_开头的文件
-            camera_pattern = os.path.join(self.uploads_dir, "camera_*")
-            camera_files = glob.glob(camera_pattern)
             camera_count = len(camera_files)
-            camera_size = sum(os.path.getsize(f) for f in camera_files if os.path.exists(f))
+            camera_size = sum(size for _, size in camera_files)
 
             # 统计face_开头的文件
-            face_pattern = os.path.join(self.uploads_dir, "face_*")
-            face_files = glob.glob(face_pattern)
             face_count = len(face_files)
-            face_size = sum(os.path.getsize(f) for f in face_files if os.path.exists(f))
+            face_size = sum(size for _, size in face_files)
 
             # 统计所有文件
-            all_files = glob.glob(os.path.join(self.uploads_dir, "*"))
             total_count = len(all_files)
-            total_size = sum(os.path.getsize(f) for f in all_files if os.path.isfile(f))
+            total_size = sum(size for _, size in all_files)
 
             return {
                 "uploads_dir_exists": True,
@@ -4,12 +4,24 @@ TTS推送工具
 import json
 import asyncio
 import uuid
-from core.handle.sendAudioHandle import send_tts_message, sendAudioMessage
-from core.providers.tts.dto.dto import SentenceType
+from collections import defaultdict
+from core.handle.sendAudioHandle import send_tts_message
+from core.providers.tts.dto.dto import ContentType, InterfaceType, SentenceType, TTSMessageDTO
 from config.logger import setup_logging
 
 TAG = __name__
 logger = setup_logging()
+_log = logger.bind(tag=TAG)
+
+# 通知类型对应的播报前缀
+_NOTIFICATION_PREFIXES = {
+    "info": "提醒：",
+    "warning": "注意：",
+    "error": "错误：",
+    "success": "成功：",
+    "system": "系统：",
+    "urgent": "紧急：",
+}
 
 
 async def send_direct_tts_message(conn, message: str, bypass_llm: bool = True):
@@ -22,16 +34,16 @@ async def send_direct_tts_message(conn, message: str, bypass_llm: bool = True):
         bypass_llm: 是否绕过LLM直接进行TTS（默认True）
     """
     try:
-        logger.bind(tag=TAG).info(f"开始发送直接TTS消息到设备 {conn.device_id}: {message}")
+        _log.info(f"开始发送直接TTS消息到设备 {conn.device_id}: {message}")
         
         # 检查TTS是否可用
         if not conn.tts:
-            logger.bind(tag=TAG).error(f"设备 {conn.device_id} TTS未初始化")
+            _log.error(f"设备 {conn.device_id} TTS未初始化")
             raise Exception("TTS服务未初始化")
         
         # 检查连接状态
         if not conn.websocket or conn.websocket.close_code is not None:
-            logger.bind(tag=TAG).error(f"设备 {conn.device_id} 连接已关闭")
+            _log.error(f"设备 {conn.device_id} 连接已关闭")
             raise Exception("设备连接已关闭")
         
         # 设置说话状态
@@ -43,21 +55,21 @@ async def send_direct_tts_message(conn, message: str, bypass_llm: bool = True):
         
         if bypass_llm:
             # 直接TTS模式 - 绕过LLM处理
-            logger.bind(tag=TAG).info(f"使用直接TTS模式发送消息: {message}")
+            _log.info(f"使用直接TTS模式发送消息: {message}")
             
-            # 导入必要的TTS类型
-            from core.providers.tts.dto.dto import ContentType, TTSMessageDTO
+            # FIRST与LAST使用同一个sentence_id
+            sentence_id = conn.sentence_id or str(uuid.uuid4())
             
             try:
                 # 发送TTS开始状态消息
-                logger.bind(tag=TAG).info(f"发送TTS开始状态消息")
+                _log.info(f"发送TTS开始状态消息")
                 await send_tts_message(conn, "start", None)
                 
                 # 发送TTS开始信号
-                logger.bind(tag=TAG).info(f"发送TTS开始信号")
+                _log.info(f"发送TTS开始信号")
                 conn.tts.tts_text_queue.put(
                     TTSMessageDTO(
-                        sentence_id=conn.sentence_id or str(uuid.uuid4()),
+                        sentence_id=sentence_id,
                         sentence_type=SentenceType.FIRST,
                         content_type=ContentType.TEXT,
                         content_detail=""
@@ -65,39 +77,40 @@ async def send_direct_tts_message(conn, message: str, bypass_llm: bool = True):
                 )
                 
                 # 发送TTS文本内容
-                logger.bind(tag=TAG).info(f"开始TTS处理文本: {message}")
+                _log.info(f"开始TTS处理文本: {message}")
                 conn.tts.tts_one_sentence(
                     conn, 
                     ContentType.TEXT, 
-                    content_detail=message
+                    content_detail=message,
+                    sentence_id=sentence_id
                 )
                 
                 # 发送TTS结束信号
-                logger.bind(tag=TAG).info(f"发送TTS结束信号")
+                _log.info(f"发送TTS结束信号")
                 conn.tts.tts_text_queue.put(
                     TTSMessageDTO(
-                        sentence_id=conn.sentence_id or str(uuid.uuid4()),
+                        sentence_id=sentence_id,
                         sentence_type=SentenceType.LAST,
                         content_type=ContentType.TEXT,
                         content_detail=""
                     )
                 )
                 
-                logger.bind(tag=TAG).info(f"直接TTS消息发送成功: {conn.device_id}")
+                _log.info(f"直接TTS消息发送成功: {conn.device_id}")
             except Exception as tts_error:
-                logger.bind(tag=TAG).error(f"直接TTS处理失败: {tts_error}")
+                _log.error(f"直接TTS处理失败: {tts_error}")
                 # 如果直接TTS失败，回退到LLM模式
-                logger.bind(tag=TAG).info(f"回退到LLM模式处理消息: {message}")
+                _log.info(f"回退到LLM模式处理消息: {message}")
                 from core.handle.receiveAudioHandle import startToChat
                 await startToChat(conn, message)
         else:
             # 通过LLM模式 - 使用完整的对话流程
-            logger.bind(tag=TAG).info(f"使用LLM模式发送消息: {message}")
+            _log.info(f"使用LLM模式发送消息: {message}")
             from core.handle.receiveAudioHandle import startToChat
             await startToChat(conn, message)
         
     except Exception as e:
-        logger.bind(tag=TAG).error(f"发送TTS消息失败: {e}")
+        _log.error(f"发送TTS消息失败: {e}")
         # 确保重置状态
         if hasattr(conn, 'client_is_speaking'):
             conn.client_is_speaking = False
@@ -120,32 +133,105 @@ async def send_notification_message(conn, message: str, notification_type: str =
     """
     try:
         # 根据通知类型添加前缀
-        prefix_map = {
-            "info": "提醒：",
-            "warning": "注意：", 
-            "error": "错误：",
-            "success": "成功：",
-            "system": "系统：",
-            "urgent": "紧急：",
-        }
-        
-        prefix = prefix_map.get(notification_type, "")
-        full_message = f"{prefix}{message}"
+        full_message = _format_notification(message, notification_type)
         
-        logger.bind(tag=TAG).info(f"发送{notification_type}类型通知到设备 {conn.device_id}: {full_message}")
+        _log.info(f"发送{notification_type}类型通知到设备 {conn.device_id}: {full_message}")
         
         # 使用直接TTS模式发送通知
         await send_direct_tts_message(conn, full_message, bypass_llm=True)
         
     except Exception as e:
-        logger.bind(tag=TAG).error(f"发送通知消息失败: {e}")
+        _log.error(f"发送通知消息失败: {e}")
         raise
 
 
+def _format_notification(message: str, notification_type: str) -> str:
+    """按通知类型为消息添加播报前缀"""
+    return f"{_NOTIFICATION_PREFIXES.get(notification_type, '')}{message}"
+
+
+def _tts_batch_key(conn):
+    """广播时可共用同一份合成音频的设备分组键，流式TTS、未初始化TTS或正在播放的设备返回None
+
+    按提供者类型和完整的构造配置分组，音色、语速、模型等任一配置不同的设备不会共用音频；
+    正在播放的设备走自身的TTS队列，避免预合成音频与正在播放的音频交错
+    """
+    if getattr(conn, 'client_is_speaking', False):
+        return None
+    tts = getattr(conn, 'tts', None)
+    if tts is None or tts.interface_type != InterfaceType.NON_STREAM:
+        return None
+    config = getattr(tts, 'config', None)
+    if config is None:
+        return None
+    try:
+        config_key = json.dumps(config, sort_keys=True, ensure_ascii=False, default=repr)
+    except (TypeError, ValueError):
+        return None
+    return (type(tts), config_key, tts.delete_audio_file, conn.audio_format)
+
+
+async def send_precomputed_audio(conn, text: str, audio_datas):
+    """
+    将已合成好的音频放入设备的播放队列，跳过该连接自身的TTS合成
+    
+    与正常TTS流程一样由连接的播放线程按实时节奏下发，入队后即返回，不等待播放结束
+    
+    Args:
+        conn: 连接处理器
+        text: 音频对应的文字
+        audio_datas: 合成好的音频帧
+    """
+    try:
+        if not conn.websocket or conn.websocket.close_code is not None:
+            raise Exception("设备连接已关闭")
+        
+        conn.client_is_speaking = True
+        conn.client_abort = False
+        
+        # 标记为第一句话，以便预缓冲
+        conn.tts.tts_audio_first_sentence = True
+        
+        await send_tts_message(conn, "start", None)
+        conn.tts.tts_audio_queue.put((SentenceType.MIDDLE, audio_datas, text))
+        conn.tts.tts_audio_queue.put((SentenceType.LAST, [], None))
+    except Exception as e:
+        _log.error(f"向设备 {conn.device_id} 播放广播音频失败: {e}")
+        conn.client_is_speaking = False
+        try:
+            await send_tts_message(conn, "stop", None)
+        except Exception as stop_error:
+            _log.debug(f"向设备 {conn.device_id} 发送TTS停止消息失败: {stop_error}")
+        raise
+
+
+async def _broadcast_tts_group(connections, message: str, notification_type: str):
+    """
+    同一TTS配置的一组设备只合成一次音频，再放入各设备的播放队列；合成失败时回退为逐个设备发送
+    """
+    full_message = _format_notification(message, notification_type)
+    first = connections[0]
+    audio_datas = None
+    try:
+        audio_datas = await asyncio.to_thread(
+            first.tts.synthesize_once, full_message, first.audio_format
+        )
+    except Exception as e:
+        _log.error(f"广播音频合成失败，回退为逐个设备发送: {e}")
+    
+    if not audio_datas:
+        return [send_notification_message(connection, message, notification_type) for connection in connections]
+    
+    _log.info(f"广播音频合成完成，复用到 {len(connections)} 个设备: {full_message}")
+    return [send_precomputed_audio(connection, full_message, audio_datas) for connection in connections]
+
+
 async def broadcast_message_to_all_devices(ws_server, message: str, notification_type: str = "info", exclude_device_ids: list = None):
     """
     向所有连接的设备广播消息
     
+    各设备的音频进入其播放队列后即视为发送成功，不等待播放结束
+    
     Args:
         ws_server: WebSocket服务器实例
         message: 要广播的消息
@@ -153,51 +239,64 @@ async def broadcast_message_to_all_devices(ws_server, message: str, notification
         exclude_device_ids: 要排除的设备ID列表
     """
     if not ws_server or not hasattr(ws_server, 'active_connections'):
-        logger.bind(tag=TAG).error("WebSocket服务器不可用")
+        _log.error("WebSocket服务器不可用")
         return
     
     exclude_device_ids = exclude_device_ids or []
-    success_count = 0
-    total_count = 0
     
-    logger.bind(tag=TAG).info(f"开始向所有设备广播消息: {message}")
+    _log.info(f"开始向所有设备广播消息: {message}")
     
-    # 创建所有发送任务
-    send_tasks = []
-    for connection in ws_server.active_connections:
-        if (hasattr(connection, 'device_id') and 
-            connection.device_id and 
-            connection.device_id not in exclude_device_ids and
-            connection.websocket and 
-            connection.websocket.close_code is None):
-            
-            total_count += 1
-            task = asyncio.create_task(
-                _send_message_with_error_handling(connection, message, notification_type)
-            )
-            send_tasks.append((connection.device_id, task))
+    # 筛选需要发送的设备
+    targets = [
+        connection for connection in ws_server.active_connections
+        if getattr(connection, 'device_id', None)
+        and connection.device_id not in exclude_device_ids
+        and connection.websocket
+        and connection.websocket.close_code is None
+    ]
+    total_count = len(targets)
+    success_count = 0
     
-    # 等待所有任务完成
-    if send_tasks:
-        logger.bind(tag=TAG).info(f"正在向 {total_count} 个设备发送广播消息...")
+    # 并发发送，单个设备失败不影响其他设备
+    if targets:
+        _log.info(f"正在向 {total_count} 个设备发送广播消息...")
         
-        for device_id, task in send_tasks:
-            try:
-                await task
+        # 按TTS配置分组，同组多个设备只合成一次
+        groups = defaultdict(list)
+        singles = []
+        for connection in targets:
+            key = _tts_batch_key(connection)
+            if key is None:
+                singles.append(connection)
+            else:
+                groups[key].append(connection)
+        
+        batches = []
+        for connections in groups.values():
+            if len(connections) == 1:
+                singles.extend(connections)
+            else:
+                batches.append(connections)
+        
+        # 各分组的合成并发进行
+        planned = await asyncio.gather(
+            *(_broadcast_tts_group(connections, message, notification_type) for connections in batches)
+        )
+        ordered = []
+        sends = []
+        for connections, group_sends in zip(batches, planned):
+            ordered.extend(connections)
+            sends.extend(group_sends)
+        for connection in singles:
+            ordered.append(connection)
+            sends.append(send_notification_message(connection, message, notification_type))
+        
+        results = await asyncio.gather(*sends, return_exceptions=True)
+        for connection, result in zip(ordered, results):
+            if isinstance(result, BaseException):
+                _log.error(f"向设备 {connection.device_id} 发送广播消息失败: {result}")
+            else:
                 success_count += 1
-                logger.bind(tag=TAG).debug(f"成功向设备 {device_id} 发送广播消息")
-            except Exception as e:
-                logger.bind(tag=TAG).error(f"向设备 {device_id} 发送广播消息失败: {e}")
+                _log.debug(f"设备 {connection.device_id} 已开始播放广播消息")
     
-    logger.bind(tag=TAG).info(f"广播消息完成: 成功 {success_count}/{total_count} 个设备")
-
-
-async def _send_message_with_error_handling(connection, message: str, notification_type: str):
-    """
-    带错误处理的消息发送
-    """
-    try:
-        await send_notification_message(connection, message, notification_type)
-    except Exception as e:
-        # 错误已在上层函数中记录，这里只是确保不影响其他设备的发送
-        pass
+    _log.info(f"广播消息已下发: {success_count}/{total_count} 个设备开始播放")
@@ -0,0 +1,8 @@
+"""测试公共配置：将 xiaozhi-server 根目录加入导入路径"""
+
+import os
+import sys
+
+SERVER_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SERVER_ROOT not in sys.path:
+    sys.path.insert(0, SERVER_ROOT)
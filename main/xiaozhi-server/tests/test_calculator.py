@@ -0,0 +1,71 @@
+"""test_mcp 计算器表达式校验与计算测试"""
+
+import importlib.util
+import os
+
+import pytest
+
+pytest.importorskip("mcp")
+pytest.importorskip("requests")
+pytest.importorskip("pytz")
+
+# test_mcp.py 作为独立MCP脚本运行，按文件路径加载，避免导入 server_mcp 包的服务端依赖
+_SCRIPT = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "core", "providers", "tools", "server_mcp", "test_mcp.py",
+)
+_spec = importlib.util.spec_from_file_location("server_mcp_test_script", _SCRIPT)
+_module = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_module)
+_safe_eval = _module._safe_eval
+
+
+@pytest.mark.parametrize(
+    "expression, expected",
+    [
+        ("1 + 2 * 3", 7),
+        ("-(4 - 6) ** 3", 8),
+        ("7 // 2 + 7 % 2", 4),
+        ("2 ** 10", 1024),
+        ("2 ** -1", 0.5),
+        ("1.5 * 4", 6.0),
+    ],
+)
+def test_evaluates_arithmetic(expression, expected):
+    assert _safe_eval(expression) == expected
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "__import__('os').system('true')",
+        "(1).__class__",
+        "x + 1",
+        "True + 1",
+        "'a' * 3",
+        "[1, 2]",
+        "1 if 1 else 2",
+        "(lambda: 1)()",
+    ],
+)
+def test_rejects_unsupported_syntax(expression):
+    with pytest.raises(ValueError):
+        _safe_eval(expression)
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "9 ** 9 ** 9 ** 9",
+        "2 ** 100000",
+        "(10 ** 1000) * (10 ** 1000) * (10 ** 1000) * (10 ** 1000) * (10 ** 1000)",
+    ],
+)
+def test_rejects_oversized_integer_results(expression):
+    with pytest.raises(ValueError, match="计算结果过大"):
+        _safe_eval(expression)
+
+
+def test_float_overflow_is_not_hidden():
+    with pytest.raises(OverflowError):
+        _safe_eval("2.0 ** 100000")
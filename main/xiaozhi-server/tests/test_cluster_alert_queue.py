@@ -0,0 +1,106 @@
+"""集群告警队列测试：环形缓冲区、高水位背压与跨线程唤醒"""
+
+import asyncio
+import threading
+
+import pytest
+
+loguru = pytest.importorskip("loguru")
+
+from core.services import cluster_alert_queue
+from core.services.cluster_alert_queue import ClusterAlertQueue, ProduceResult, _Ring
+
+
+def _alert(cluster_id: str, alert_id: str = "a1") -> dict:
+    """构造最小的webhook告警数据"""
+    return {
+        "request_body": {
+            "alertId": alert_id,
+            "alarmObjInfo": {
+                "dimensions": {"objId": f"uin#{cluster_id}#node-1"},
+            },
+        }
+    }
+
+
+@pytest.fixture
+def queue(monkeypatch):
+    # 跳过配置文件加载，直接使用loguru默认logger
+    monkeypatch.setattr(cluster_alert_queue, "setup_logging", lambda: loguru.logger)
+
+    def _make(**kwargs):
+        return ClusterAlertQueue(**kwargs)
+
+    return _make
+
+
+def test_ring_wraps_and_overwrites_oldest():
+    ring = _Ring(3)
+    for item in (1, 2, 3):
+        ring.push(item)
+    assert len(ring) == 3
+
+    # 写满后继续写入，覆盖最旧的元素
+    ring.push(4)
+    ring.push(5)
+    assert len(ring) == 3
+    assert [ring.pop() for _ in range(3)] == [3, 4, 5]
+    assert len(ring) == 0
+
+
+def test_ring_head_wraps_around_buffer():
+    ring = _Ring(2)
+    results = []
+    for item in range(5):
+        ring.push(item)
+        results.append(ring.pop())
+    assert results == [0, 1, 2, 3, 4]
+    assert ring.buf == [None, None]
+
+
+def test_high_watermark_rejects_and_counts_dropped(queue):
+    q = queue(max_queue_size=10, high_watermark=0.5)
+    for i in range(5):
+        assert q.produce_alert(_alert("cls-a", f"a{i}")) is ProduceResult.ACCEPTED
+
+    assert q.produce_alert(_alert("cls-a", "a5")) is ProduceResult.FULL
+    assert q.produce_alert(_alert("cls-a", "a6")) is ProduceResult.FULL
+    assert q.stats["dropped"] == 2
+    assert q.stats["total_produced"] == 5
+    assert q.get_queue_size("cls-a") == 5
+    assert q.get_metrics()["queue_depth_pct"] == {"cls-a": 50.0}
+
+    # 被拒绝的告警不会覆盖已入队的告警
+    assert q.pop_nowait("cls-a")["request_body"]["alertId"] == "a0"
+    assert q.produce_alert(_alert("cls-a", "a7")) is ProduceResult.ACCEPTED
+
+
+def test_alert_without_cluster_is_not_counted_as_dropped(queue):
+    q = queue()
+    result = q.produce_alert({"request_body": {}})
+    assert result is ProduceResult.NO_CLUSTER
+    assert not result
+    assert q.stats["dropped"] == 0
+
+
+def test_wait_for_wakes_up_on_produce_from_another_thread(queue):
+    q = queue()
+
+    async def main():
+        timer = threading.Timer(0.05, q.produce_alert, args=(_alert("cls-b"),))
+        timer.start()
+        try:
+            woke = await q.wait_for(["cls-a", "cls-b"], timeout=5)
+        finally:
+            timer.join()
+        return woke
+
+    assert asyncio.run(main()) is True
+    assert q.pop_nowait("cls-b") is not None
+    assert q._waiters == {}
+
+
+def test_wait_for_times_out_without_alerts(queue):
+    q = queue()
+    assert asyncio.run(q.wait_for("cls-a", timeout=0.01)) is False
+    assert q._waiters == {}